@@ -1,8 +1,10 @@
 """Main initialisation code."""
 
+import asyncio
 import functools as ft
 import json
 import logging
+import time
 
 import voluptuous as vol
 import yaml
@@ -13,6 +15,7 @@ from oauthlib.oauth2.rfc6749.errors import InvalidClientError
 
 from .classes.permissions import Permissions
 from .const import (
+    ACCOUNT_SETUP_CONCURRENCY,
     CONF_ACCOUNT,
     CONF_ACCOUNT_CONF,
     CONF_ACCOUNT_NAME,
@@ -48,13 +51,41 @@ async def async_setup(hass, config):
     accounts = MULTI_ACCOUNT_SCHEMA(conf)[CONF_ACCOUNTS]
     conf_type = CONST_CONFIG_TYPE_LIST
 
-    for account in accounts:
-        await _async_setup_account(hass, account, conf_type)
+    # Accounts are independent, so one slow or failing tenant should not hold up the rest
+    semaphore = asyncio.Semaphore(ACCOUNT_SETUP_CONCURRENCY)
+    results = await asyncio.gather(
+        *(
+            _async_setup_account_limited(hass, semaphore, account, conf_type)
+            for account in accounts
+        ),
+        return_exceptions=True,
+    )
+    for account, result in zip(accounts, results):
+        if isinstance(result, Exception):
+            _LOGGER.error(
+                "Error setting up account: %s - %s",
+                account.get(CONF_ACCOUNT_NAME, CONST_PRIMARY),
+                result,
+                exc_info=result,
+            )
 
     _LOGGER.debug("Finish")
     return True
 
 
+async def _async_setup_account_limited(hass, semaphore, account_conf, conf_type):
+    async with semaphore:
+        start = time.monotonic()
+        try:
+            await _async_setup_account(hass, account_conf, conf_type)
+        finally:
+            _LOGGER.debug(
+                "Setup for account: %s took %.2fs",
+                account_conf.get(CONF_ACCOUNT_NAME, CONST_PRIMARY),
+                time.monotonic() - start,
+            )
+
+
 async def _async_setup_account(hass, account_conf, conf_type):
     credentials = (
         account_conf.get(CONF_CLIENT_ID),
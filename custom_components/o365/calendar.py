@@ -1,11 +1,13 @@
 """Main calendar processing."""
 
+import asyncio
 import functools as ft
 import logging
-import re
+from bisect import bisect_right
 from copy import deepcopy
 from datetime import date, datetime, timedelta
-from operator import attrgetter
+from itertools import accumulate
+from operator import attrgetter, is_, itemgetter
 from typing import Any
 
 from homeassistant.components.calendar import (
@@ -34,11 +36,17 @@ from .const import (
     ATTR_EVENT_ID,
     ATTR_HEX_COLOR,
     ATTR_OFFSET,
+    CALENDAR_CACHE_MAX_AGE,
+    CALENDAR_DELTA_WINDOW_DAYS,
     CALENDAR_ENTITY_ID_FORMAT,
+    CALENDAR_RANGE_CACHE_TTL,
     CONF_ACCOUNT,
     CONF_ACCOUNT_NAME,
     CONF_CAL_ID,
     CONF_CAL_IDS,
+    CONF_CALENDAR_CACHE,
+    CONF_CALENDAR_DELTA_SYNC,
+    CONF_CALENDAR_LOCAL_RECURRENCE,
     CONF_CONFIG_TYPE,
     CONF_DEVICE_ID,
     CONF_ENABLE_UPDATE,
@@ -46,6 +54,7 @@ from .const import (
     CONF_EXCLUDE,
     CONF_HOURS_BACKWARD_TO_GET,
     CONF_HOURS_FORWARD_TO_GET,
+    CONF_INCLUDE,
     CONF_MAX_RESULTS,
     CONF_PERMISSIONS,
     CONF_SEARCH,
@@ -62,11 +71,18 @@ from .const import (
     EVENT_REMOVE_CALENDAR_EVENT,
     EVENT_REMOVE_CALENDAR_RECURRENCES,
     EVENT_RESPOND_CALENDAR_EVENT,
+    GRAPH_ENDPOINT_CALENDAR_VIEW,
+    GRAPH_ENDPOINT_CALENDAR_VIEW_DELTA,
+    GRAPH_ENDPOINT_EVENT,
+    GRAPH_ENDPOINT_EVENT_INSTANCES,
+    JSON_CALENDAR_DELTA_FILENAME,
     LEGACY_ACCOUNT_NAME,
     PERM_CALENDARS_READWRITE,
     YAML_CALENDARS_FILENAME,
     EventResponse,
 )
+from .helpers.batch import O365GraphBatch, build_api_object, get_all_items
+from .helpers.delta import O365DeltaStore
 from .schema import (
     CALENDAR_SERVICE_CREATE_SCHEMA,
     CALENDAR_SERVICE_MODIFY_SCHEMA,
@@ -76,10 +92,13 @@ from .schema import (
 )
 from .utils.calendar_utils import (
     add_call_data_to_event,
+    build_event_filter,
+    expand_series_master,
     format_event_data,
     get_end_date,
     get_hass_date,
     get_start_date,
+    parse_occurrence_id,
 )
 from .utils.filemgmt import (
     async_update_calendar_file,
@@ -107,6 +126,7 @@ async def async_setup_platform(hass, config, add_entities, discovery_info=None):
         conf[CONF_ENABLE_UPDATE]
         and conf[CONF_PERMISSIONS].validate_authorization(PERM_CALENDARS_READWRITE)
     )
+    conf[CONF_CALENDAR_CACHE] = O365CalendarCache(hass, conf)
     cal_ids = await _async_setup_add_entities(
         hass, account, add_entities, conf, update_supported
     )
@@ -135,7 +155,7 @@ async def _async_setup_add_entities(
             device_id = entity["device_id"]
             try:
                 cal = O365CalendarEntity(
-                    account,
+                    conf[CONF_CALENDAR_CACHE],
                     cal_id,
                     entity,
                     entity_id,
@@ -213,7 +233,7 @@ class O365CalendarEntity(CalendarEntity):
 
     def __init__(
         self,
-        account,
+        calendar_cache,
         calendar_id,
         entity,
         entity_id,
@@ -223,7 +243,6 @@ class O365CalendarEntity(CalendarEntity):
     ):
         """Initialise the O365 Calendar Event."""
         self._config = config
-        self._account = account
         self._start_offset = entity.get(CONF_HOURS_BACKWARD_TO_GET)
         self._end_offset = entity.get(CONF_HOURS_FORWARD_TO_GET)
         self._event = {}
@@ -231,7 +250,8 @@ class O365CalendarEntity(CalendarEntity):
         self.entity_id = entity_id
         self._offset_reached = False
         self._data_attribute = []
-        self.data = self._init_data(account, calendar_id, entity)
+        self._formatted = {}
+        self.data = self._init_data(calendar_cache, calendar_id, entity)
         self._calendar_id = calendar_id
         self._device_id = device_id
         if update_supported:
@@ -241,16 +261,19 @@ class O365CalendarEntity(CalendarEntity):
                 | CalendarEntityFeature.UPDATE_EVENT
             )
 
-    def _init_data(self, account, calendar_id, entity):
+    def _init_data(self, calendar_cache, calendar_id, entity):
         max_results = entity.get(CONF_MAX_RESULTS)
-        search = entity.get(CONF_SEARCH)
-        exclude = entity.get(CONF_EXCLUDE)
+        event_filter = build_event_filter(
+            entity.get(CONF_SEARCH),
+            entity.get(CONF_INCLUDE),
+            entity.get(CONF_EXCLUDE),
+        )
+        shared_calendar = calendar_cache.get(calendar_id)
+        shared_calendar.register(self._start_offset, self._end_offset)
         return O365CalendarData(
-            account,
+            shared_calendar,
             self.entity_id,
-            calendar_id,
-            search,
-            exclude,
+            event_filter,
             max_results,
         )
 
@@ -294,22 +317,36 @@ class O365CalendarEntity(CalendarEntity):
 
     async def async_update(self):
         """Do the update."""
-        await self.data.async_update(self.hass)
+        results = await self.data.async_update(
+            self.hass,
+            dt_util.utcnow() + timedelta(hours=self._start_offset),
+            dt_util.utcnow() + timedelta(hours=self._end_offset),
+        )
         event = deepcopy(self.data.event)
         if event:
             event.summary, offset = extract_offset(event.summary, DEFAULT_OFFSET)
             start = O365CalendarData.to_datetime(event.start)
             self._offset_reached = is_offset_reached(start, offset)
-        results = await self.data.async_o365_get_events(
-            self.hass,
-            dt_util.utcnow() + timedelta(hours=self._start_offset),
-            dt_util.utcnow() + timedelta(hours=self._end_offset),
-        )
 
         if results is not None:
-            self._data_attribute = [format_event_data(x) for x in results]
+            self._data_attribute = self._format_events(results)
         self._event = event
 
+    def _format_events(self, events):
+        """Format the events, reusing those unchanged since the last update."""
+        data = []
+        formatted = {}
+        for event in events:
+            # Graph updates the modified time whenever the change key changes
+            key = (event.object_id, event.modified)
+            event_data = self._formatted.get(key) or format_event_data(event)
+            if event.modified is not None:
+                formatted[key] = event_data
+            data.append(event_data)
+        # Only events still in the window are kept for the next update
+        self._formatted = formatted
+        return data
+
     async def async_create_event(self, **kwargs: Any) -> None:
         """Add a new event to calendar."""
         start = kwargs[EVENT_START]
@@ -374,6 +411,7 @@ class O365CalendarEntity(CalendarEntity):
         event = add_call_data_to_event(event, subject, start, end, **kwargs)
         await self.hass.async_add_executor_job(event.save)
         self._raise_event(EVENT_CREATE_CALENDAR_EVENT, event.object_id)
+        self.data.invalidate()
         self.async_schedule_update_ha_state(True)
 
     async def async_modify_calendar_event(
@@ -416,6 +454,7 @@ class O365CalendarEntity(CalendarEntity):
         event = add_call_data_to_event(event, subject, start, end, **kwargs)
         await self.hass.async_add_executor_job(event.save)
         self._raise_event(ha_event, event_id)
+        self.data.invalidate()
         self.async_schedule_update_ha_state(True)
 
     async def async_remove_calendar_event(
@@ -447,6 +486,7 @@ class O365CalendarEntity(CalendarEntity):
             event.delete,
         )
         self._raise_event(ha_event, event_id)
+        self.data.invalidate()
         self.async_schedule_update_ha_state(True)
 
     async def async_respond_calendar_event(
@@ -462,6 +502,7 @@ class O365CalendarEntity(CalendarEntity):
 
         await self._async_send_response(event_id, response, send_response, message)
         self._raise_event(EVENT_RESPOND_CALENDAR_EVENT, event_id)
+        self.data.invalidate()
         self.async_schedule_update_ha_state(True)
 
     async def _async_send_response(self, event_id, response, send_response, message):
@@ -488,6 +529,7 @@ class O365CalendarEntity(CalendarEntity):
 
     async def _async_get_event_from_calendar(self, event_id):
         calendar = self.data.calendar
+        event_id = await self.data.async_get_event_id(self.hass, event_id)
         return await self.hass.async_add_executor_job(calendar.get_event, event_id)
 
     def _validate_permissions(self, error_message):
@@ -513,94 +555,244 @@ class O365CalendarEntity(CalendarEntity):
         _LOGGER.debug("%s - %s", event_type, event_id)
 
 
-class O365CalendarData:
-    """O365 Calendar Data."""
+class O365CalendarCache:
+    """Shared calendars for an account, by calendar id."""
 
-    def __init__(
-        self,
-        account,
-        entity_id,
-        calendar_id,
-        search=None,
-        exclude=None,
-        limit=999,
-    ):
-        """Initialise the O365 Calendar Data."""
-        self._limit = limit
-        self.group_calendar = calendar_id.startswith(CONST_GROUP)
+    def __init__(self, hass, config):
+        """Initialise the calendar cache."""
+        self._account = config[CONF_ACCOUNT]
+        self._calendars = {}
+        self._local_recurrence = config.get(CONF_CALENDAR_LOCAL_RECURRENCE, False)
+        self._delta_store = (
+            O365DeltaStore(hass, config, JSON_CALENDAR_DELTA_FILENAME)
+            if config.get(CONF_CALENDAR_DELTA_SYNC)
+            else None
+        )
+
+    def get(self, calendar_id):
+        """Get the shared calendar."""
+        if calendar_id not in self._calendars:
+            self._calendars[calendar_id] = O365SharedCalendar(
+                self._account, calendar_id, self._delta_store, self._local_recurrence
+            )
+        return self._calendars[calendar_id]
+
+
+class O365SharedCalendar:
+    """Calendar events fetched once for all the entities using the calendar."""
+
+    def __init__(self, account, calendar_id, delta_store=None, local_recurrence=False):
+        """Initialise the shared calendar."""
         self.calendar_id = calendar_id
+        self.group_calendar = calendar_id.startswith(CONST_GROUP)
+        self._account = account
         if self.group_calendar:
             self._schedule = None
             self.calendar = account.schedule(resource=self.calendar_id)
+            # Group calendars do not support calendar view delta queries
+            self._delta_store = None
+            self._local_recurrence = False
         else:
             self._schedule = account.schedule()
             self.calendar = None
-        self._search = search
-        self._exclude = exclude
-        self.event = None
-        self._entity_id = entity_id
-        self._error = False
+            self._delta_store = delta_store
+            self._local_recurrence = local_recurrence
+        self._series = {}
+        self._delta_window = None
+        self._delta_items = None
+        self._delta_events = None
+        self._delta_synced = None
+        self._offsets = []
+        self._lock = asyncio.Lock()
+        self._events = None
+        self._fetch_start = None
+        self._fetch_end = None
+        self._fetched = None
+        self._ranges = []
+
+    def register(self, start_offset, end_offset):
+        """Register the window an entity needs for its updates."""
+        self._offsets.append((start_offset, end_offset))
 
-    async def _async_get_calendar(self, hass):
+    async def async_get_events(self, hass, start_date, end_date):
+        """Get the unfiltered events between the dates."""
+        async with self._lock:
+            if not self.calendar and not await self._async_get_calendar(hass):
+                return []
+
+            now = dt_util.utcnow()
+            if self._delta_store and await self._async_sync_delta(hass, now):
+                delta_start, delta_end = self._delta_window
+                if delta_start <= start_date and end_date <= delta_end:
+                    return O365CalendarData.events_in_range(
+                        self._delta_events, start_date, end_date
+                    )
+
+            if not self._is_cached(start_date, end_date, now):
+                fetch_start, fetch_end = self._build_update_window(now)
+                if start_date < fetch_start or end_date > fetch_end:
+                    return await self._async_get_range_events(
+                        hass, start_date, end_date, now
+                    )
+                events = await self._async_calendar_schedule_get_events(
+                    hass, fetch_start, fetch_end
+                )
+                if events is None:
+                    return None
+                self._events = events
+                self._fetch_start = fetch_start
+                self._fetch_end = fetch_end
+                self._fetched = now
+                self._ranges = [
+                    item
+                    for item in self._ranges
+                    if item[0] < fetch_start or item[1] > fetch_end
+                ]
+                self._ranges.append((fetch_start, fetch_end, now, events))
+
+        return O365CalendarData.events_in_range(self._events, start_date, end_date)
+
+    async def async_get_event_id(self, hass, event_id):
+        """Get the Graph id of an event, looking up locally expanded occurrences."""
+        if not (occurrence := parse_occurrence_id(event_id)):
+            return event_id
         try:
-            self.calendar = await hass.async_add_executor_job(
-                ft.partial(self._schedule.get_calendar, calendar_id=self.calendar_id)
+            occurrence_id = await hass.async_add_executor_job(
+                _get_occurrence_id, self.calendar, *occurrence
             )
-            return True
         except (HTTPError, RetryError, ConnectionError) as err:
-            _LOGGER.warning("Error getting calendar events - %s", err)
-            return False
-
-    async def async_o365_get_events(self, hass, start_date, end_date):
-        """Get the events."""
-        if not self.calendar:
-            if not await self._async_get_calendar(hass):
-                return []
+            _LOGGER.warning("Error getting calendar event - %s", err)
+            return event_id
+        return occurrence_id or event_id
+
+    def invalidate(self):
+        """Drop cached events after the calendar has been changed."""
+        self._fetched = None
+        self._ranges = []
+        self._delta_synced = None
+
+    async def _async_sync_delta(self, hass, now):
+        """Apply the latest changes to the calendar view over a rolling window."""
+        update_start, update_end = self._build_update_window(now)
+        if self._delta_window is None:
+            self._delta_window = await self._async_get_delta_window()
+        if (
+            self._delta_window is None
+            or update_start < self._delta_window[0]
+            or update_end > self._delta_window[1]
+        ):
+            # Move the window on, which starts a new sync
+            self._delta_window = (
+                update_start.replace(microsecond=0),
+                update_end.replace(microsecond=0)
+                + timedelta(days=CALENDAR_DELTA_WINDOW_DAYS),
+            )
+        elif self._delta_synced and now - self._delta_synced < timedelta(
+            seconds=CALENDAR_CACHE_MAX_AGE
+        ):
+            return True
 
-        events = await self._async_calendar_schedule_get_events(
-            hass, self.calendar, start_date, end_date
+        url = self.calendar.build_url(
+            GRAPH_ENDPOINT_CALENDAR_VIEW_DELTA.format(calendar_id=self.calendar_id)
         )
-        if events is None:
-            return None
-
-        events = self._filter_events(events)
-        events = self._sort_events(events)
-
-        return events
+        params = {
+            "startDateTime": self._delta_window[0].isoformat(),
+            "endDateTime": self._delta_window[1].isoformat(),
+        }
+        try:
+            items = await self._delta_store.async_sync(
+                self.calendar.con, self.calendar_id, url, params
+            )
+        except (HTTPError, RetryError, ConnectionError) as err:
+            _LOGGER.warning("Error syncing calendar events - %s", err)
+            return False
 
-    def _filter_events(self, events):
-        lst_events = list(events)
-        if not events or not self._exclude:
-            return lst_events
+        if items is not self._delta_items:
+            self._delta_events = await hass.async_add_executor_job(
+                _build_events, self.calendar, items
+            )
+            self._delta_items = items
+        self._delta_synced = now
+        return True
 
-        rtn_events = []
-        for event in lst_events:
-            include = True
-            for exclude in self._exclude:
-                if re.search(exclude, event.subject):
-                    include = False
-            if include:
-                rtn_events.append(event)
+    async def _async_get_delta_window(self):
+        """Get the window the calendar view was last synced over."""
+        if params := await self._delta_store.async_get_params(self.calendar_id):
+            return (
+                dt_util.parse_datetime(params["startDateTime"]),
+                dt_util.parse_datetime(params["endDateTime"]),
+            )
+        return None
 
-        return rtn_events
+    async def _async_get_range_events(self, hass, start_date, end_date, now):
+        """Get events from the cached ranges, only fetching what they do not cover."""
+        max_age = timedelta(seconds=CALENDAR_RANGE_CACHE_TTL)
+        self._ranges = [item for item in self._ranges if now - item[2] < max_age]
+        covering = sorted(
+            (
+                item
+                for item in self._ranges
+                if item[0] < end_date and item[1] > start_date
+            ),
+            key=itemgetter(0),
+        )
+        gaps = []
+        position = start_date
+        for range_start, range_end, _, _ in covering:
+            if range_start > position:
+                gaps.append((position, range_start))
+            position = max(position, range_end)
+        if position < end_date:
+            gaps.append((position, end_date))
+
+        for gap_start, gap_end in gaps:
+            events = await self._async_calendar_schedule_get_events(
+                hass, gap_start, gap_end
+            )
+            if events is None:
+                return None
+            self._ranges.append((gap_start, gap_end, now, events))
+
+        # An event spanning ranges is in each of them, so keep the latest copy
+        events = {}
+        for range_start, range_end, _, range_events in sorted(
+            self._ranges, key=itemgetter(2)
+        ):
+            if range_start < end_date and range_end > start_date:
+                for event in range_events:
+                    events[event.object_id] = event
+        return O365CalendarData.events_in_range(events.values(), start_date, end_date)
 
-    def _sort_events(self, events):
-        for event in events:
-            event.start_sort = event.start
-            if event.is_all_day:
-                event.start_sort = dt_util.as_utc(
-                    dt_util.start_of_local_day(event.start)
-                )
+    def _is_cached(self, start_date, end_date, now):
+        return (
+            self._fetched is not None
+            and now - self._fetched < timedelta(seconds=CALENDAR_CACHE_MAX_AGE)
+            and self._fetch_start <= start_date
+            and end_date <= self._fetch_end
+        )
 
-        events.sort(key=attrgetter("start_sort"))
+    def _build_update_window(self, now):
+        start = dt_util.as_utc(dt_util.start_of_local_day())
+        end = start + timedelta(days=1)
+        for start_offset, end_offset in self._offsets:
+            start = min(start, now + timedelta(hours=start_offset))
+            end = max(end, now + timedelta(hours=end_offset))
+        # Entities updating later in the same cycle ask for a slightly later window
+        return start, end + timedelta(seconds=CALENDAR_CACHE_MAX_AGE)
 
-        return events
+    async def _async_get_calendar(self, hass):
+        try:
+            self.calendar = await hass.async_add_executor_job(
+                ft.partial(self._schedule.get_calendar, calendar_id=self.calendar_id)
+            )
+            return True
+        except (HTTPError, RetryError, ConnectionError) as err:
+            _LOGGER.warning("Error getting calendar events - %s", err)
+            return False
 
-    async def _async_calendar_schedule_get_events(
-        self, hass, calendar_schedule, start_date, end_date
-    ):
+    async def _async_calendar_schedule_get_events(self, hass, start_date, end_date):
         """Get the events for the calendar."""
-        query = calendar_schedule.new_query()
+        query = self.calendar.new_query()
         query = query.select(
             "subject",
             "body",
@@ -612,20 +804,26 @@ class O365CalendarData:
             "sensitivity",
             "show_as",
             "attendees",
+            "organizer",
             "series_master_id",
+            "last_modified_date_time",
         )
+        if self._local_recurrence:
+            events = await self._async_get_local_events(
+                hass, query.get_selects(), start_date, end_date
+            )
+            if events is not None:
+                return events
+
         query = query.on_attribute("start").greater_equal(start_date)
         query.chain("and").on_attribute("end").less_equal(end_date)
-        if self._search is not None:
-            query.chain("and").on_attribute("subject").contains(self._search)
-        # As at March 2023 not contains is not supported by Graph API
-        # if self._exclude is not None:
-        #     query.chain("and").on_attribute("subject").negate().contains(self._exclude)
+        # Filters and limits are applied by each entity, as they may differ
         try:
             return await hass.async_add_executor_job(
                 ft.partial(
-                    calendar_schedule.get_events,
-                    limit=self._limit,
+                    _get_events_list,
+                    self.calendar,
+                    limit=None,
                     query=query,
                     include_recurring=True,
                 )
@@ -634,11 +832,112 @@ class O365CalendarData:
             _LOGGER.warning("Error getting calendar events - %s", err)
             return None
 
+    async def _async_get_local_events(self, hass, selects, start_date, end_date):
+        """Get the events, expanding recurring series from the cached masters.
+
+        Returns None if they cannot be fetched, so that the server expands them.
+        """
+        try:
+            items = await hass.async_add_executor_job(
+                _get_calendar_view, self.calendar, start_date, end_date, selects
+            )
+            occurrences = await hass.async_add_executor_job(
+                _get_calendar_view_occurrences, self.calendar, start_date, end_date
+            )
+            self._series = await hass.async_add_executor_job(
+                _sync_series_masters,
+                self._account,
+                self.calendar,
+                self._series,
+                selects,
+                occurrences,
+            )
+        except (HTTPError, RetryError, ConnectionError) as err:
+            _LOGGER.warning("Error getting recurring calendar events - %s", err)
+            return None
+        return await hass.async_add_executor_job(
+            _build_local_events,
+            self.calendar,
+            self._series,
+            items,
+            occurrences,
+            start_date,
+            end_date,
+        )
+
+
+class O365CalendarData:
+    """O365 Calendar Data."""
+
+    def __init__(
+        self,
+        shared_calendar,
+        entity_id,
+        event_filter=None,
+        limit=999,
+    ):
+        """Initialise the O365 Calendar Data."""
+        self._limit = limit
+        self._shared_calendar = shared_calendar
+        self.group_calendar = shared_calendar.group_calendar
+        self.calendar_id = shared_calendar.calendar_id
+        self._event_filter = event_filter
+        self.event = None
+        self._entity_id = entity_id
+        self._error = False
+        self._index = None
+        self._today_index = None
+
+    @property
+    def calendar(self):
+        """O365 calendar."""
+        return self._shared_calendar.calendar
+
+    def invalidate(self):
+        """Drop cached events after the calendar has been changed."""
+        self._shared_calendar.invalidate()
+
+    async def async_get_event_id(self, hass, event_id):
+        """Get the Graph id of an event."""
+        return await self._shared_calendar.async_get_event_id(hass, event_id)
+
+    async def async_o365_get_events(self, hass, start_date, end_date):
+        """Get the events, filtered and sorted but not limited."""
+        events = await self._shared_calendar.async_get_events(
+            hass, start_date, end_date
+        )
+        if events is None:
+            return None
+
+        events = self._filter_events(events)
+        return self._sort_events(events)
+
+    def _limit_events(self, events):
+        return events[: self._limit] if self._limit else events
+
+    def _filter_events(self, events):
+        if self._event_filter is None:
+            return list(events)
+        return list(filter(self._event_filter, events))
+
+    def _sort_events(self, events):
+        for event in events:
+            event.start_sort = event.start
+            if event.is_all_day:
+                event.start_sort = dt_util.as_utc(
+                    dt_util.start_of_local_day(event.start)
+                )
+
+        events.sort(key=attrgetter("start_sort"))
+
+        return events
+
     async def async_get_events(self, hass, start_date, end_date):
         """Get the via async."""
         results = await self.async_o365_get_events(hass, start_date, end_date)
         if not results:
             return []
+        results = self._limit_events(results)
 
         event_list = []
         for vevent in results:
@@ -661,28 +960,38 @@ class O365CalendarData:
 
         return event_list
 
-    async def async_update(self, hass):
-        """Do the update."""
+    async def async_update(self, hass, start_date, end_date):
+        """Do the update, returning the events between the dates."""
         start_of_day_utc = dt_util.as_utc(dt_util.start_of_local_day())
+        end_of_day_utc = start_of_day_utc + timedelta(days=1)
+        # One fetch covers both today, for the current event, and the requested dates
         results = await self.async_o365_get_events(
             hass,
-            start_of_day_utc,
-            start_of_day_utc + timedelta(days=1),
+            min(start_of_day_utc, start_date),
+            max(end_of_day_utc, end_date),
         )
-        if not results:
-            _LOGGER.debug(
-                "No current event found for %s",
-                self._entity_id,
-            )
-            self.event = None
-            return
+        if results is None:
+            self._update_event(None)
+            return None
 
-        vevent = self._get_root_event(results)
+        # The events are the same objects until the shared calendar fetches again
+        if self._index is None or not self._index.is_index_of(results):
+            self._index = O365EventIndex(results)
+        # The limit applies to today and to the requested dates on their own
+        today = self._limit_events(
+            self._index.in_range(start_of_day_utc, end_of_day_utc)
+        )
+        if self._today_index is None or not self._today_index.is_index_of(today):
+            self._today_index = O365EventIndex(today)
+        self._update_event(
+            self._today_index.get_root_event(dt_util.utcnow(), end_of_day_utc)
+        )
+        return self._limit_events(self._index.in_range(start_date, end_date))
 
+    def _update_event(self, vevent):
         if vevent is None:
             _LOGGER.debug(
-                "No matching event found in the %d results for %s",
-                len(results),
+                "No current event found for %s",
                 self._entity_id,
             )
             self.event = None
@@ -704,35 +1013,15 @@ class O365CalendarData:
                 )
                 self._error = True
 
-    def _get_root_event(self, results):
-        started_event = None
-        not_started_event = None
-        all_day_event = None
-        for event in results:
-            if event.is_all_day:
-                if not all_day_event and not self.is_finished(event):
-                    all_day_event = event
-                continue
-            if self.is_started(event) and not self.is_finished(event):
-                if not started_event:
-                    started_event = event
-                continue
-            if (
-                not self.is_finished(event)
-                and not event.is_all_day
-                and not not_started_event
-            ):
-                not_started_event = event
-
-        vevent = None
-        if started_event:
-            vevent = started_event
-        elif all_day_event:
-            vevent = all_day_event
-        elif not_started_event:
-            vevent = not_started_event
-
-        return vevent
+    @staticmethod
+    def events_in_range(events, start_date, end_date):
+        """Events overlapping the dates, as a calendar view selects them."""
+        return [
+            event
+            for event in events
+            if O365CalendarData.to_datetime(get_start_date(event)) < end_date
+            and O365CalendarData.to_datetime(get_end_date(event)) > start_date
+        ]
 
     @staticmethod
     def is_all_day(vevent):
@@ -773,6 +1062,62 @@ class O365CalendarData:
         return dt_util.as_utc(date_obj)
 
 
+class O365EventIndex:
+    """Sorted events with their UTC start and end, for lookups by time."""
+
+    def __init__(self, events):
+        """Initialise the index from events sorted by start."""
+        self.events = tuple(events)
+        self.starts = tuple(
+            O365CalendarData.to_datetime(get_start_date(event)) for event in events
+        )
+        self.ends = tuple(
+            O365CalendarData.to_datetime(get_end_date(event)) for event in events
+        )
+        self._timed = [i for i, event in enumerate(events) if not event.is_all_day]
+        self._all_day = [i for i, event in enumerate(events) if event.is_all_day]
+        self._timed_starts = [self.starts[i] for i in self._timed]
+        # Running maximums, so the first end after now is the first unfinished event
+        self._timed_ends = list(accumulate((self.ends[i] for i in self._timed), max))
+        self._all_day_ends = list(
+            accumulate((self.ends[i] for i in self._all_day), max)
+        )
+
+    def is_index_of(self, events):
+        """Whether the index was built from these events."""
+        return len(events) == len(self.events) and all(map(is_, events, self.events))
+
+    def in_range(self, start_date, end_date):
+        """Events overlapping the dates, as a calendar view selects them."""
+        return [
+            event
+            for event, start, end in zip(self.events, self.starts, self.ends)
+            if start < end_date and end > start_date
+        ]
+
+    def get_root_event(self, now, end_date):
+        """Get the event to show at now, from those starting before end_date.
+
+        This is the earliest started event, else the earliest unfinished all day
+        event, else the next event to start.
+        """
+        started = bisect_right(self._timed_starts, now)
+        position = bisect_right(self._timed_ends, now)
+        if position < started:
+            return self.events[self._timed[position]]
+
+        position = bisect_right(self._all_day_ends, now)
+        if (
+            position < len(self._all_day)
+            and self.starts[self._all_day[position]] < end_date
+        ):
+            return self.events[self._all_day[position]]
+
+        if started < len(self._timed) and self._timed_starts[started] < end_date:
+            return self.events[self._timed[started]]
+        return None
+
+
 class CalendarServices:
     """Calendar Services."""
 
@@ -782,8 +1127,8 @@ class CalendarServices:
 
     async def async_scan_for_calendars(self, call):  # pylint: disable=unused-argument
         """Scan for new calendars."""
-        for config in self._hass.data[DOMAIN]:
-            config = self._hass.data[DOMAIN][config]
+        # Other accounts may be added while the calendars are being fetched
+        for config in list(self._hass.data[DOMAIN].values()):
             if CONF_ACCOUNT in config:
                 schedule = config[CONF_ACCOUNT].schedule()
                 calendars = await self._hass.async_add_executor_job(
@@ -799,6 +1144,128 @@ class CalendarServices:
                     )
 
 
+def _build_events(calendar, items):
+    return [
+        build_api_object(calendar, calendar.event_constructor, item)
+        for item in items.values()
+    ]
+
+
+def _get_events_list(calendar_schedule, **kwargs):
+    # Read all pages here, so that none are fetched from the event loop
+    return list(calendar_schedule.get_events(**kwargs))
+
+
+def _sync_series_masters(account, calendar, series, selects, occurrences):
+    """Get the series masters of the occurrences, fetching only those that changed.
+
+    An occurrence is modified whenever its series is, so a series is fetched
+    again when one of its occurrences was modified after it.
+    """
+    last_modified = {}
+    for occurrence in occurrences:
+        master_id = occurrence["seriesMasterId"]
+        modified = _parse_graph_datetime(occurrence.get("lastModifiedDateTime"))
+        if modified and (
+            master_id not in last_modified or modified > last_modified[master_id]
+        ):
+            last_modified[master_id] = modified
+        else:
+            last_modified.setdefault(master_id, None)
+    masters = {}
+    for master_id, modified in last_modified.items():
+        if master_id not in series:
+            continue
+        held = _parse_graph_datetime(series[master_id].get("lastModifiedDateTime"))
+        if held and (modified is None or modified <= held):
+            masters[master_id] = series[master_id]
+    if len(masters) == len(last_modified):
+        return masters
+
+    params = {"$select": f"{selects},recurrence"}
+    batch = O365GraphBatch(account)
+    request_ids = {
+        master_id: batch.add(
+            calendar.build_url(GRAPH_ENDPOINT_EVENT.format(event_id=master_id)), params
+        )
+        for master_id in last_modified
+        if master_id not in masters
+    }
+    responses = batch.execute()
+    for master_id, request_id in request_ids.items():
+        response = responses[request_id]
+        response.raise_for_status()
+        masters[master_id] = response.json()
+    return masters
+
+
+def _get_calendar_view(calendar, start_date, end_date, selects):
+    """Get the single events and exceptions, leaving out the occurrences."""
+    url = calendar.build_url(
+        GRAPH_ENDPOINT_CALENDAR_VIEW.format(calendar_id=calendar.calendar_id)
+    )
+    params = {
+        "startDateTime": start_date.isoformat(),
+        "endDateTime": end_date.isoformat(),
+        "$filter": "type ne 'occurrence'",
+        "$select": f"{selects},type,originalStart",
+        "$top": calendar.protocol.max_top_value,
+    }
+    return get_all_items(calendar.con, url, params)
+
+
+def _get_calendar_view_occurrences(calendar, start_date, end_date):
+    """Get just enough of each occurrence to expand it from its series master."""
+    url = calendar.build_url(
+        GRAPH_ENDPOINT_CALENDAR_VIEW.format(calendar_id=calendar.calendar_id)
+    )
+    params = {
+        "startDateTime": start_date.isoformat(),
+        "endDateTime": end_date.isoformat(),
+        "$filter": "type eq 'occurrence'",
+        "$select": "seriesMasterId,originalStart,lastModifiedDateTime",
+        "$top": calendar.protocol.max_top_value,
+    }
+    return get_all_items(calendar.con, url, params)
+
+
+def _build_local_events(calendar, series, items, occurrences, start_date, end_date):
+    # Cancelled occurrences, and those replaced by exceptions, are not in the view
+    occurrence_starts = {}
+    for occurrence in occurrences:
+        occurrence_starts.setdefault(occurrence["seriesMasterId"], set()).add(
+            _parse_graph_datetime(occurrence["originalStart"])
+        )
+    events = [
+        build_api_object(calendar, calendar.event_constructor, item) for item in items
+    ]
+    for master_id, master in series.items():
+        events.extend(
+            build_api_object(calendar, calendar.event_constructor, item)
+            for item in expand_series_master(
+                master, start_date, end_date, occurrence_starts[master_id]
+            )
+        )
+    return events
+
+
+def _parse_graph_datetime(value):
+    return dt_util.parse_datetime(value) if value else None
+
+
+def _get_occurrence_id(calendar, series_master_id, start):
+    url = calendar.build_url(
+        GRAPH_ENDPOINT_EVENT_INSTANCES.format(event_id=series_master_id)
+    )
+    params = {
+        "startDateTime": start.isoformat(),
+        "endDateTime": (start + timedelta(minutes=1)).isoformat(),
+        "$select": "id",
+    }
+    items = calendar.con.get(url, params=params).json().get("value", [])
+    return items[0]["id"] if items else None
+
+
 def _group_calendar_log(entity_id):
     raise ServiceValidationError(
         translation_domain=DOMAIN,
@@ -20,6 +20,7 @@ class O365Entity(CoordinatorEntity):
         self._entity_id = entity_id
         self.entity_type = entity_type
         self._unique_id = unique_id
+        self._data_version = None
 
     @property
     def name(self):
@@ -36,6 +37,34 @@ class O365Entity(CoordinatorEntity):
         """Entity unique id."""
         return self._unique_id
 
+    @property
+    def available(self):
+        """Entity is available once its first update has succeeded."""
+        return (
+            super().available
+            and self.coordinator.data is not None
+            and self.entity_key in self.coordinator.data
+        )
+
+    def _handle_coordinator_update(self) -> None:
+        if self._data_changed():
+            self.async_write_ha_state()
+
+    def _data_changed(self, *depends_on):
+        """Check whether the entity's data or availability changed since last seen.
+
+        Anything else the entity's state depends on is passed as depends_on.
+        """
+        data_version = (
+            self.coordinator.data_version(self.entity_key),
+            self.coordinator.last_update_success,
+            *depends_on,
+        )
+        if data_version == self._data_version:
+            return False
+        self._data_version = data_version
+        return True
+
     def _validate_permissions(self, required_permission, required_permission_error):
         if not self._config[CONF_PERMISSIONS].validate_authorization(
             required_permission
@@ -40,12 +40,9 @@ class O365MailSensor(O365Entity, SensorEntity):
 
     _attr_translation_key = "mail"
 
-    def __init__(self, coordinator, config, sensor_conf, name, entity_id, unique_id):
+    def __init__(self, coordinator, config, name, entity_id, unique_id):
         """Initialise the O365 Sensor."""
         super().__init__(coordinator, config, name, entity_id, SENSOR_EMAIL, unique_id)
-        self._download_attachments = sensor_conf.get(CONF_DOWNLOAD_ATTACHMENTS)
-        self._html_body = sensor_conf.get(CONF_HTML_BODY)
-        self._show_body = sensor_conf.get(CONF_SHOW_BODY)
         self._state = None
         self._extra_attributes = None
         self._update_status()
@@ -61,24 +58,17 @@ class O365MailSensor(O365Entity, SensorEntity):
         return self._extra_attributes
 
     def _handle_coordinator_update(self) -> None:
-        self._update_status()
-        self.async_write_ha_state()
+        if self._data_changed():
+            self._update_status()
+            self.async_write_ha_state()
 
     def _update_status(self) -> None:
         data = self.coordinator.data[self.entity_key][ATTR_DATA]
-        attrs = self._get_attributes(data)
+        attrs = [get_email_attributes(x) for x in data]
         attrs.sort(key=itemgetter("received"), reverse=True)
         self._state = len(attrs)
         self._extra_attributes = {ATTR_DATA: attrs}
 
-    def _get_attributes(self, data):
-        return [
-            get_email_attributes(
-                x, self._download_attachments, self._html_body, self._show_body
-            )
-            for x in data
-        ]
-
 
 class O365AutoReplySensor(O365Entity, SensorEntity):
     """O365 Auto Reply sensor processing."""
@@ -218,6 +208,74 @@ def build_query_query(mail_folder, sensor_conf):
     return query
 
 
+def build_inbox_filter(sensor_conf):
+    """Build local message filter for email sensor, matching build_inbox_query."""
+    return _build_filter(_build_base_checks(sensor_conf))
+
+
+def build_query_filter(sensor_conf):
+    """Build local message filter for query sensor, matching build_query_query."""
+    checks = _build_base_checks(sensor_conf)
+
+    if (body_contains := sensor_conf.get(CONF_BODY_CONTAINS)) is not None:
+        body_contains = body_contains.casefold()
+        checks.append(
+            lambda message: body_contains
+            in (message.get("body") or {}).get("content", "").casefold()
+        )
+    if (subject_contains := sensor_conf.get(CONF_SUBJECT_CONTAINS)) is not None:
+        subject_contains = subject_contains.casefold()
+        checks.append(
+            lambda message: subject_contains
+            in (message.get("subject") or "").casefold()
+        )
+    if (subject_is := sensor_conf.get(CONF_SUBJECT_IS)) is not None:
+        subject_is = subject_is.casefold()
+        checks.append(
+            lambda message: subject_is == (message.get("subject") or "").casefold()
+        )
+    if (has_attachment := sensor_conf.get(CONF_HAS_ATTACHMENT)) is not None:
+        checks.append(
+            lambda message: message.get("hasAttachments", False) == has_attachment
+        )
+    if (email_from := sensor_conf.get(CONF_MAIL_FROM)) is not None:
+        email_from = email_from.casefold()
+        checks.append(lambda message: email_from == _message_from(message).casefold())
+    if (importance := sensor_conf.get(CONF_IMPORTANCE)) is not None:
+        importance = importance.casefold()
+        checks.append(
+            lambda message: importance == (message.get("importance") or "").casefold()
+        )
+
+    return _build_filter(checks)
+
+
+def _message_from(message):
+    email_address = (message.get("from") or {}).get("emailAddress") or {}
+    return email_address.get("address") or ""
+
+
+def _build_base_checks(sensor_conf):
+    checks = []
+    if (is_unread := sensor_conf.get(CONF_IS_UNREAD)) is not None:
+        checks.append(lambda message: message.get("isRead") == (not is_unread))
+    return checks
+
+
+def _build_filter(checks):
+    """Combine the checks, as the query filters are combined with 'and'.
+
+    Returns None if every message matches.
+    """
+    if not checks:
+        return None
+
+    def message_filter(message):
+        return all(check(message) for check in checks)
+
+    return message_filter
+
+
 def _add_to_query(query, qtype, attribute_name, attribute_value, check_value=True):
     if attribute_value is None or check_value is None:
         return query
@@ -11,6 +11,7 @@ class EventResponse(Enum):
     Decline = "decline"  # pylint: disable=invalid-name
 
 
+ACCOUNT_SETUP_CONCURRENCY = 3
 ATTR_ACTIVITY = "activity"
 ATTR_ALL_DAY = "all_day"
 ATTR_ALL_TODOS = "all_todos"
@@ -62,6 +63,7 @@ ATTR_SUBJECT = "subject"
 ATTR_SUMMARY = "summary"
 ATTR_TODOS = "todos"
 ATTR_TODO_ID = "todo_id"
+ATTR_TODO_IDS = "todo_ids"
 ATTR_TOPIC = "topic"
 ATTR_TYPE = "type"
 ATTR_ZIP_ATTACHMENTS = "zip_attachments"
@@ -71,7 +73,11 @@ AUTH_CALLBACK_PATH_ALT = "/api/o365"
 AUTH_CALLBACK_PATH_DEFAULT = (
     "https://login.microsoftonline.com/common/oauth2/nativeclient"
 )
+CALENDAR_CACHE_MAX_AGE = 30
 CALENDAR_ENTITY_ID_FORMAT = "calendar.{}"
+CALENDAR_DELTA_WINDOW_DAYS = 7
+CALENDAR_FILTER_FIELDS = ("subject", "location", "categories", "body", "organizer")
+CALENDAR_RANGE_CACHE_TTL = 300
 CONF_ACCOUNT = "account"
 CONF_ACCOUNTS = "accounts"
 CONF_ACCOUNT_CONF = "account_conf"
@@ -80,9 +86,13 @@ CONF_ALT_AUTH_METHOD = "alt_auth_method"
 CONF_AUTH_URL = "auth_url"
 CONF_AUTO_REPLY_SENSORS = "auto_reply_sensors"
 CONF_BASIC_CALENDAR = "basic_calendar"
+CONF_BATCH_REQUESTS = "batch_requests"
 CONF_BODY_CONTAINS = "body_contains"
 CONF_CAL_ID = "cal_id"
 CONF_CAL_IDS = "cal_ids"
+CONF_CALENDAR_CACHE = "calendar_cache"
+CONF_CALENDAR_DELTA_SYNC = "calendar_delta_sync"
+CONF_CALENDAR_LOCAL_RECURRENCE = "calendar_local_recurrence"
 CONF_CHAT_SENSORS = "chat_sensors"
 CONF_CLIENT_ID = "client_id"
 CONF_CLIENT_SECRET = "client_secret"  # nosec
@@ -94,26 +104,33 @@ CONF_DOWNLOAD_ATTACHMENTS = "download_attachments"
 CONF_DUE_HOURS_BACKWARD_TO_GET = "due_start_offset"
 CONF_DUE_HOURS_FORWARD_TO_GET = "due_end_offset"
 CONF_EMAIL_ACCOUNT = "email_account"
+CONF_EMAIL_DELTA_SYNC = "email_delta_sync"
 CONF_EMAIL_SENSORS = "email_sensor"
 CONF_ENABLE_CALENDAR = "enable_calendar"
 CONF_ENABLE_UPDATE = "enable_update"
+CONF_DELTA_SYNC = "delta_sync"
 CONF_ENTITIES = "entities"
 CONF_ENTITY_KEY = "entity_key"
 CONF_ENTITY_TYPE = "entity_type"
 CONF_EXCLUDE = "exclude"
 CONF_FAILED_PERMISSIONS = "failed_permissions"
+CONF_FAST_START = "fast_start"
 CONF_GROUPS = "groups"
 CONF_HAS_ATTACHMENT = "has_attachment"
 CONF_HOURS_BACKWARD_TO_GET = "start_offset"
 CONF_HOURS_FORWARD_TO_GET = "end_offset"
 CONF_HTML_BODY = "html_body"
+CONF_HTML_BODY_MAX_SIZE = "html_body_max_size"
+CONF_INCLUDE = "include"
 CONF_SHOW_BODY = "show_body"
 CONF_IMPORTANCE = "importance"
 CONF_IS_UNREAD = "is_unread"
 CONF_KEYS_EMAIL = "keys_email"
 CONF_KEYS_SENSORS = "keys_sensors"
+CONF_MAIL_FILTER = "mail_filter"
 CONF_MAIL_FOLDER = "folder"
 CONF_MAIL_FROM = "from"
+CONF_MAX_CONCURRENT_UPDATES = "max_concurrent_updates"
 CONF_MAX_ITEMS = "max_items"
 CONF_MAX_RESULTS = "max_results"
 CONF_O365_MAIL_FOLDER = "mail_folder"
@@ -134,6 +151,7 @@ CONF_TRACK_NEW_CALENDAR = "track_new_calendar"
 CONF_TRACK_NEW = "track_new"
 CONF_YAML_TASK_LIST_ID = "task_list_id"
 CONF_YAML_TASK_LIST = "yaml_task_list"
+CONF_UPDATE_INTERVAL = "update_interval"
 CONF_URL = "url"
 CONST_CONFIG_TYPE_LIST = "list"
 CONST_GROUP = "group:"
@@ -148,6 +166,23 @@ DOMAIN = "o365"
 ENTITY_ID_FORMAT_SENSOR = "sensor.{}"
 ENTITY_ID_FORMAT_TODO = "todo.{}"
 
+GRAPH_BATCH_ENDPOINT = "/$batch"
+GRAPH_BATCH_MAX_REQUESTS = 20
+GRAPH_THROTTLED_STATUS_CODES = (429, 503)
+GRAPH_ENDPOINT_CALENDAR_VIEW = "/calendars/{calendar_id}/calendarView"
+GRAPH_ENDPOINT_CALENDAR_VIEW_DELTA = "/calendars/{calendar_id}/calendarView/delta"
+GRAPH_ENDPOINT_EVENT = "/events/{event_id}"
+GRAPH_ENDPOINT_EVENT_INSTANCES = "/events/{event_id}/instances"
+GRAPH_ENDPOINT_MAIL_FOLDER_MESSAGES = "/mailFolders/{folder_id}/messages"
+GRAPH_ENDPOINT_MAIL_FOLDER_MESSAGES_DELTA = "/mailFolders/{folder_id}/messages/delta"
+GRAPH_ENDPOINT_MAILBOX_SETTINGS = "/mailboxSettings"
+GRAPH_ENDPOINT_MESSAGE_ATTACHMENTS = "/messages/{message_id}/attachments"
+GRAPH_ENDPOINT_MY_PRESENCE = "/me/presence"
+GRAPH_ENDPOINT_TASK = "/todo/lists/{folder_id}/tasks/{task_id}"
+GRAPH_ENDPOINT_TASKS = "/todo/lists/{folder_id}/tasks"
+GRAPH_ENDPOINT_TASKS_DELTA = "/todo/lists/{folder_id}/tasks/delta"
+GRAPH_ENDPOINT_USER_PRESENCE = "/users/{user_id}/presence"
+
 EVENT_HA_EVENT = "ha_event"
 EVENT_COMPLETED_TODO = "completed_todo"
 EVENT_DELETE_TODO = "delete_todo"
@@ -166,6 +201,7 @@ EVENT_UPDATE_USER_STATUS = "update_user_status"
 EVENT_UPDATE_USER_PREFERRED_STATUS = "update_user_preferred_status"
 
 LEGACY_ACCOUNT_NAME = "converted"
+MAIL_DELTA_WINDOW_DAYS = 30
 O365_STORAGE = "o365_storage"
 O365_STORAGE_TOKEN = ".O365-token-cache"
 PERM_CALENDARS_READ = "Calendars.Read"
@@ -191,9 +227,20 @@ SENSOR_AUTO_REPLY = "auto_reply"
 SENSOR_EMAIL = "inbox"
 SENSOR_TEAMS_STATUS = "teams_status"
 SENSOR_TEAMS_CHAT = "teams_chat"
+SNAPSHOT_SAVE_DELAY = 60
+SNAPSHOT_STORAGE_KEY = "o365.{0}_{1}_snapshot"
+SNAPSHOT_STORAGE_VERSION = 1
+TODO_BATCH_RETRIES = 3
+TODO_BATCH_RETRY_DEFAULT_WAIT = 5
+TODO_BATCH_RETRY_MAX_WAIT = 30
+TODO_REFRESH_COOLDOWN = 5
 TODO_TODO = "todo"
 TOKEN_FILENAME = "o365{0}.token"  # nosec
 TOKEN_FILE_MISSING = "missing"
+JSON_CALENDAR_DELTA_FILENAME = "{0}_calendar_delta{1}.json"
+JSON_EMAIL_DELTA_FILENAME = "{0}_email_delta{1}.json"
+JSON_MAIL_FOLDERS_FILENAME = "{0}_mail_folders{1}.json"
+JSON_TODO_DELTA_FILENAME = "{0}_todo_delta{1}.json"
 YAML_CALENDARS_FILENAME = "{0}_calendars{1}.yaml"
 YAML_TASK_LISTS_FILENAME = "{0}_tasks{1}.yaml"
 
@@ -213,3 +260,11 @@ INDEXES = {
     "+4": "fourth",
     "-1": "last",
 }
+FREQUENCIES = {
+    "daily": "DAILY",
+    "weekly": "WEEKLY",
+    "absoluteMonthly": "MONTHLY",
+    "relativeMonthly": "MONTHLY",
+    "absoluteYearly": "YEARLY",
+    "relativeYearly": "YEARLY",
+}
@@ -0,0 +1,138 @@
+"""Microsoft Graph JSON batching."""
+
+import logging
+from urllib.parse import quote, urlencode
+
+from requests.exceptions import HTTPError, RetryError
+
+from ..const import (
+    GRAPH_BATCH_ENDPOINT,
+    GRAPH_BATCH_MAX_REQUESTS,
+    GRAPH_THROTTLED_STATUS_CODES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class O365BatchResponse:
+    """Response to a single request within a batch."""
+
+    def __init__(self, status_code, headers, body):
+        """Initialise the response."""
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.body = body
+
+    def __bool__(self):
+        """Success of the request."""
+        return 200 <= self.status_code < 300
+
+    def json(self):
+        """Body of the response."""
+        return self.body
+
+    def raise_for_status(self):
+        """Raise HTTPError for a failed request, as requests does."""
+        if self.status_code < 400:
+            return
+        message = ""
+        if isinstance(self.body, dict):
+            message = self.body.get("error", {}).get("message", "")
+        raise HTTPError(
+            f"{self.status_code} Error in batch request | Error Message: {message}",
+            response=self,
+        )
+
+
+class O365GraphBatch:
+    """Combine Graph requests into JSON $batch calls."""
+
+    def __init__(self, account, batch_url=None):
+        """Initialise the batch."""
+        self._con = account.con
+        self._service_url = account.protocol.service_url.rstrip("/")
+        self._batch_url = batch_url or f"{self._service_url}{GRAPH_BATCH_ENDPOINT}"
+        self._requests = []
+
+    def __len__(self):
+        """Number of requests in the batch."""
+        return len(self._requests)
+
+    def add(self, url, params=None, method="GET", body=None, headers=None):
+        """Add a request to the batch, returning its id."""
+        request_id = str(len(self._requests))
+        request = {
+            "id": request_id,
+            "method": method,
+            "url": self._relative_url(url, params),
+        }
+        if body is not None:
+            request["body"] = body
+            headers = {"Content-Type": "application/json"} | (headers or {})
+        if headers:
+            request["headers"] = headers
+        self._requests.append(request)
+        return request_id
+
+    def execute(self):
+        """Send the batch, returning the responses by request id."""
+        responses = {}
+        for start in range(0, len(self._requests), GRAPH_BATCH_MAX_REQUESTS):
+            chunk = self._requests[start : start + GRAPH_BATCH_MAX_REQUESTS]
+            response = self._con.post(self._batch_url, data={"requests": chunk})
+            for item in response.json().get("responses", []):
+                responses[item["id"]] = O365BatchResponse(
+                    item.get("status", 500), item.get("headers"), item.get("body")
+                )
+        self._requests = []
+        return responses
+
+    def _relative_url(self, url, params):
+        url = url.removeprefix(self._service_url)
+        if params:
+            query = urlencode(params, quote_via=quote, safe="$'(),:/")
+            url = f"{url}?{query}"
+        return url
+
+
+async def async_batch_get(hass, account, requests, batch_url=None):
+    """Send GET requests, keyed by caller, as $batch calls.
+
+    Returns the response for each key. A key is missing from the result
+    if the batch could not be sent, or Graph throttled its request, so the
+    caller can fall back to a direct request, which is retried as needed.
+    """
+    if not requests:
+        return {}
+    batch = O365GraphBatch(account, batch_url)
+    request_ids = {
+        key: batch.add(url, params) for key, (url, params) in requests.items()
+    }
+    try:
+        responses = await hass.async_add_executor_job(batch.execute)
+    except (HTTPError, RetryError, ConnectionError) as err:
+        _LOGGER.warning("Error sending batch request - %s", err)
+        return {}
+    return {
+        key: responses[request_id]
+        for key, request_id in request_ids.items()
+        if request_id in responses
+        and responses[request_id].status_code not in GRAPH_THROTTLED_STATUS_CODES
+    }
+
+
+def get_all_items(con, url, params):
+    """Get every item of a Graph collection, following the next links."""
+    items = []
+    while url:
+        data = con.get(url, params=params).json()
+        items.extend(data.get("value", []))
+        url = data.get("@odata.nextLink")
+        params = None
+    return items
+
+
+def build_api_object(parent, constructor, data, **kwargs):
+    """Build an O365 object from Graph JSON, as the O365 library does."""
+    cloud_data_key = parent._cloud_data_key  # pylint: disable=protected-access
+    return constructor(parent=parent, **kwargs, **{cloud_data_key: data})
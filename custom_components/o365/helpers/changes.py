@@ -0,0 +1,39 @@
+"""Change detection for the coordinators' per-key data."""
+
+from ..const import CONF_ENTITY_KEY
+
+
+class O365ChangeTracker:
+    """Track a version for each coordinator key that moves on when its data changes."""
+
+    def __init__(self):
+        """Initialise the tracker."""
+        self._digests = {}
+        self._versions = {}
+
+    def keys_updated(self, keys, data):
+        """Record the latest data for the keys."""
+        for key in keys:
+            entity_key = key[CONF_ENTITY_KEY]
+            if entity_key in data:
+                self.key_data_updated(entity_key, data[entity_key])
+
+    def key_data_updated(self, entity_key, key_data):
+        """Record the latest data for a single key."""
+        digest = _digest(key_data)
+        if digest != self._digests.get(entity_key):
+            self._digests[entity_key] = digest
+            self._versions[entity_key] = self._versions.get(entity_key, 0) + 1
+
+    def version(self, entity_key):
+        """Return the version of the key's data."""
+        return self._versions.get(entity_key, 0)
+
+
+def _digest(value):
+    """Build a hashable copy of the data, to compare with the previous copy."""
+    if isinstance(value, dict):
+        return tuple((key, _digest(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_digest(item) for item in value)
+    return value
@@ -1,17 +1,25 @@
 """Sensor processing."""
 
+import asyncio
 import functools as ft
+import heapq
 import logging
 from datetime import datetime, timedelta
 
 from homeassistant.const import CONF_EMAIL, CONF_ENABLED, CONF_NAME, CONF_UNIQUE_ID
 from homeassistant.helpers import entity_registry
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.entity import async_generate_entity_id
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 from requests.exceptions import HTTPError
 
-from ..classes.mailsensor import build_inbox_query, build_query_query
+from ..classes.mailsensor import (
+    build_inbox_filter,
+    build_inbox_query,
+    build_query_filter,
+    build_query_query,
+)
 from ..const import (
     ATTR_AUTOREPLIESSETTINGS,
     ATTR_CHAT_ID,
@@ -30,14 +38,21 @@ from ..const import (
     CONF_ACCOUNT,
     CONF_ACCOUNT_NAME,
     CONF_AUTO_REPLY_SENSORS,
+    CONF_BATCH_REQUESTS,
+    CONF_BODY_CONTAINS,
     CONF_CHAT_SENSORS,
+    CONF_DELTA_SYNC,
     CONF_DOWNLOAD_ATTACHMENTS,
     CONF_EMAIL_ACCOUNT,
+    CONF_EMAIL_DELTA_SYNC,
     CONF_EMAIL_SENSORS,
     CONF_ENABLE_UPDATE,
     CONF_ENTITY_KEY,
     CONF_ENTITY_TYPE,
+    CONF_FAST_START,
+    CONF_MAIL_FILTER,
     CONF_MAIL_FOLDER,
+    CONF_MAX_CONCURRENT_UPDATES,
     CONF_MAX_ITEMS,
     CONF_O365_MAIL_FOLDER,
     CONF_O365_TASK_FOLDER,
@@ -47,22 +62,53 @@ from ..const import (
     CONF_STATUS_SENSORS,
     CONF_TODO_SENSORS,
     CONF_TRACK,
+    CONF_UPDATE_INTERVAL,
     CONF_YAML_TASK_LIST,
     CONF_YAML_TASK_LIST_ID,
     DOMAIN,
     ENTITY_ID_FORMAT_SENSOR,
     ENTITY_ID_FORMAT_TODO,
+    GRAPH_ENDPOINT_MAIL_FOLDER_MESSAGES,
+    GRAPH_ENDPOINT_MAIL_FOLDER_MESSAGES_DELTA,
+    GRAPH_ENDPOINT_MAILBOX_SETTINGS,
+    GRAPH_ENDPOINT_MESSAGE_ATTACHMENTS,
+    GRAPH_ENDPOINT_MY_PRESENCE,
+    GRAPH_ENDPOINT_TASKS,
+    GRAPH_ENDPOINT_TASKS_DELTA,
+    GRAPH_ENDPOINT_USER_PRESENCE,
+    JSON_EMAIL_DELTA_FILENAME,
+    JSON_MAIL_FOLDERS_FILENAME,
+    JSON_TODO_DELTA_FILENAME,
     LEGACY_ACCOUNT_NAME,
+    MAIL_DELTA_WINDOW_DAYS,
     SENSOR_AUTO_REPLY,
     SENSOR_EMAIL,
     SENSOR_TEAMS_CHAT,
     SENSOR_TEAMS_STATUS,
+    TODO_REFRESH_COOLDOWN,
     TODO_TODO,
     YAML_TASK_LISTS_FILENAME,
 )
 from ..schema import YAML_TASK_LIST_SCHEMA
-from ..todo import O365TodoEntityServices, build_todo_query
-from ..utils.filemgmt import build_config_file_path, build_yaml_filename, load_yaml_file
+from ..todo import (
+    O365TodoEntityServices,
+    build_todo_query,
+    build_todo_record,
+    filter_todos,
+)
+from ..utils.filemgmt import (
+    build_config_file_path,
+    build_yaml_filename,
+    load_json_file,
+    load_yaml_file,
+    save_json_file,
+)
+from ..utils.utils import build_auto_reply_record, build_mail_record
+from .batch import async_batch_get, build_api_object, get_all_items
+from .changes import O365ChangeTracker
+from .delta import O365DeltaStore
+from .scheduler import O365UpdateScheduler
+from .snapshot import O365SnapshotStore
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -77,8 +123,13 @@ class O365SensorCordinator(DataUpdateCoordinator):
             _LOGGER,
             # Name of the data. For logging purposes.
             name="O365 Sensors",
-            # Polling interval. Will only be polled if there are subscribers.
+            # Polling interval is set from the keys once they are known.
+            # Will only be polled if there are subscribers.
             update_interval=timedelta(seconds=30),
+            # Changes are applied locally, so refresh once a burst of them is over
+            request_refresh_debouncer=Debouncer(
+                hass, _LOGGER, cooldown=TODO_REFRESH_COOLDOWN, immediate=False
+            ),
         )
         self._config = config
         self._account = config[CONF_ACCOUNT]
@@ -90,6 +141,20 @@ class O365SensorCordinator(DataUpdateCoordinator):
         )
         self._chat_members = {}
         self._ent_reg = entity_registry.async_get(hass)
+        self._semaphore = asyncio.Semaphore(config[CONF_MAX_CONCURRENT_UPDATES])
+        self._scheduler = O365UpdateScheduler()
+        self._changes = O365ChangeTracker()
+        todo_sensors = config.get(CONF_TODO_SENSORS) or {}
+        self._todo_delta = (
+            O365DeltaStore(hass, config, JSON_TODO_DELTA_FILENAME)
+            if todo_sensors.get(CONF_DELTA_SYNC)
+            else None
+        )
+        self._snapshot = (
+            O365SnapshotStore(hass, self._account_name, "sensors")
+            if config[CONF_FAST_START]
+            else None
+        )
 
     async def async_setup_entries(self):
         """Do the initial setup of the entities."""
@@ -98,6 +163,7 @@ class O365SensorCordinator(DataUpdateCoordinator):
         todo_keys = await self._async_todo_sensors()
         auto_reply_entities = await self._async_auto_reply_sensors()
         self._keys = chat_keys + status_keys + todo_keys + auto_reply_entities
+        self.update_interval = self._scheduler.update_interval(self._keys)
         return self._keys
 
     async def _async_status_sensors(self):
@@ -113,6 +179,9 @@ class O365SensorCordinator(DataUpdateCoordinator):
                 CONF_NAME: name,
                 CONF_ENTITY_TYPE: SENSOR_TEAMS_STATUS,
                 CONF_EMAIL: sensor_conf.get(CONF_EMAIL),
+                CONF_UPDATE_INTERVAL: timedelta(
+                    seconds=sensor_conf.get(CONF_UPDATE_INTERVAL)
+                ),
             }
             if sensor_conf.get(CONF_EMAIL):
                 email_account = await self.hass.async_add_executor_job(
@@ -137,6 +206,9 @@ class O365SensorCordinator(DataUpdateCoordinator):
                 CONF_NAME: name,
                 CONF_ENTITY_TYPE: SENSOR_TEAMS_CHAT,
                 CONF_ENABLE_UPDATE: sensor_conf.get(CONF_ENABLE_UPDATE),
+                CONF_UPDATE_INTERVAL: timedelta(
+                    seconds=sensor_conf.get(CONF_UPDATE_INTERVAL)
+                ),
             }
 
             keys.append(new_key)
@@ -158,11 +230,14 @@ class O365SensorCordinator(DataUpdateCoordinator):
                 YAML_TASK_LIST_SCHEMA,
             )
             o365_task_lists = list(o365_task_dict.values())
-            keys = await self._async_todo_entities(o365_task_lists)
+            keys = await self._async_todo_entities(
+                o365_task_lists,
+                timedelta(seconds=todo_sensors.get(CONF_UPDATE_INTERVAL)),
+            )
 
         return keys
 
-    async def _async_todo_entities(self, o365_task_lists):
+    async def _async_todo_entities(self, o365_task_lists, update_interval):
         keys = []
         o365_tasks = self._account.tasks()
         for o365_tasklist in o365_task_lists:
@@ -192,6 +267,7 @@ class O365SensorCordinator(DataUpdateCoordinator):
                     CONF_NAME: name,
                     CONF_YAML_TASK_LIST: o365_tasklist,
                     CONF_ENTITY_TYPE: TODO_TODO,
+                    CONF_UPDATE_INTERVAL: update_interval,
                 }
 
                 keys.append(new_key)
@@ -219,50 +295,146 @@ class O365SensorCordinator(DataUpdateCoordinator):
                 CONF_UNIQUE_ID: f"{name}_{self._account_name}",
                 CONF_NAME: name,
                 CONF_ENTITY_TYPE: SENSOR_AUTO_REPLY,
+                CONF_UPDATE_INTERVAL: timedelta(
+                    seconds=sensor_conf.get(CONF_UPDATE_INTERVAL)
+                ),
             }
 
             keys.append(new_key)
         return keys
 
+    def data_version(self, entity_key):
+        """Return a version of the key's data that changes when the data does."""
+        return self._changes.version(entity_key)
+
+    async def async_restore_snapshot(self):
+        """Use the data saved by the last run until the first refresh."""
+        if not self._snapshot:
+            return False
+        data = await self._snapshot.async_load(self._keys)
+        if data is None:
+            return False
+        self._data = data
+        self._changes.keys_updated(self._keys, data)
+        self.async_set_updated_data(data)
+        return True
+
+    async def async_todos_changed(self, entity_key, records):
+        """Apply changes to tasks to the held data straight away.
+
+        Records, by task id, replace or add tasks, and None removes them. The
+        key is refreshed from Graph once a burst of changes is over.
+        """
+        if (data := self._data.get(entity_key)) and ATTR_DATA in data:
+            data[ATTR_DATA] = _replace_todos(data[ATTR_DATA], records)
+            self._changes.key_data_updated(entity_key, data)
+            self.async_update_listeners()
+        self._scheduler.force_update(entity_key)
+        await self.async_request_refresh()
+
     async def _async_update_data(self):
+        now = dt_util.utcnow()
+        keys = self._scheduler.due_keys(self._keys, now)
         _LOGGER.debug(
-            "Doing %s sensor update(s) for: %s", len(self._keys), self._account_name
+            "Doing %s sensor update(s) for: %s", len(keys), self._account_name
         )
 
-        for key in self._keys:
+        responses = await self._async_batch_responses(keys)
+        results = await asyncio.gather(
+            *(
+                self._async_update_key(key, responses.get(key[CONF_ENTITY_KEY]))
+                for key in keys
+            ),
+            return_exceptions=True,
+        )
+        error = None
+        for key, result in zip(keys, results):
+            # Failed keys are retried at their own interval
+            self._scheduler.key_updated(key, now)
+            if not isinstance(result, Exception):
+                continue
+            error = result
+            _LOGGER.warning(
+                "Error updating %s for: %s - %s",
+                key[CONF_NAME],
+                self._account_name,
+                result,
+            )
+        if error and not self._data:
+            raise UpdateFailed(
+                f"Error updating sensors for: {self._account_name} - {error}"
+            ) from error
+
+        self._changes.keys_updated(keys, self._data)
+        if self._snapshot:
+            self._snapshot.async_save(self._data)
+        self.update_interval = self._scheduler.next_interval(
+            self._keys, dt_util.utcnow()
+        )
+        return self._data
+
+    async def _async_batch_responses(self, keys):
+        if not self._config[CONF_BATCH_REQUESTS]:
+            return {}
+        requests = {
+            key[CONF_ENTITY_KEY]: request
+            for key in keys
+            if (request := self._build_batch_request(key))
+        }
+        return await async_batch_get(self.hass, self._account, requests)
+
+    def _build_batch_request(self, key):
+        entity_type = key[CONF_ENTITY_TYPE]
+        if entity_type == TODO_TODO:
+            if self._todo_delta:
+                return None
+            return _build_todos_request(key)
+        if entity_type == SENSOR_TEAMS_STATUS:
+            teams = self._account.teams()
+            if email_account := key.get(CONF_EMAIL_ACCOUNT):
+                endpoint = GRAPH_ENDPOINT_USER_PRESENCE.format(user_id=email_account)
+            else:
+                endpoint = GRAPH_ENDPOINT_MY_PRESENCE
+            return teams.build_url(endpoint), None
+        if entity_type == SENSOR_AUTO_REPLY:
+            mailbox = self._account.mailbox()
+            return mailbox.build_url(GRAPH_ENDPOINT_MAILBOX_SETTINGS), None
+        return None
+
+    async def _async_update_key(self, key, response):
+        async with self._semaphore:
             entity_type = key[CONF_ENTITY_TYPE]
             _LOGGER.debug("%s for: %s", entity_type, self._account_name)
             if entity_type == TODO_TODO:
-                await self._async_todos_update(key)
+                await self._async_todos_update(key, response)
             elif entity_type == SENSOR_TEAMS_CHAT:
                 await self._async_teams_chat_update(key)
             elif entity_type == SENSOR_TEAMS_STATUS:
-                await self._async_teams_status_update(key)
+                await self._async_teams_status_update(key, response)
             elif entity_type == SENSOR_AUTO_REPLY:
-                await self._async_auto_reply_update(key)
+                await self._async_auto_reply_update(key, response)
 
-        return self._data
-
-    async def _async_teams_status_update(self, key):
+    async def _async_teams_status_update(self, key, response=None):
         """Update state."""
         entity_key = key[CONF_ENTITY_KEY]
         email_account = key.get(CONF_EMAIL_ACCOUNT)
-        if not email_account:
-            if data := await self.hass.async_add_executor_job(
-                self._account.teams().get_my_presence
-            ):
-                self._data[entity_key] = {ATTR_STATE: data.activity}
-            return
-        if data := await self.hass.async_add_executor_job(
-            self._account.teams().get_user_presence, email_account
-        ):
+        teams = self._account.teams()
+        if response is not None:
+            response.raise_for_status()
+            data = build_api_object(teams, teams.presence_constructor, response.json())
+        elif email_account:
+            data = await self.hass.async_add_executor_job(
+                teams.get_user_presence, email_account
+            )
+        else:
+            data = await self.hass.async_add_executor_job(teams.get_my_presence)
+        if data:
             self._data[entity_key] = {ATTR_STATE: data.activity}
 
     async def _async_teams_chat_update(self, key):
         entity_key = key[CONF_ENTITY_KEY]
         state = None
         data = []
-        self._data[entity_key] = {}
         extra_attributes = {}
         chats = await self.hass.async_add_executor_job(
             ft.partial(self._account.teams().get_my_chats, limit=20)
@@ -328,7 +500,7 @@ class O365SensorCordinator(DataUpdateCoordinator):
         self._chat_members[chat.object_id] = memberlist
         return memberlist
 
-    async def _async_todos_update(self, key):
+    async def _async_todos_update(self, key, response=None):
         """Update state."""
         entity_key = key[CONF_ENTITY_KEY]
         if entity_key in self._data:
@@ -336,24 +508,35 @@ class O365SensorCordinator(DataUpdateCoordinator):
         else:
             self._data[entity_key] = {ATTR_TODOS: {}, ATTR_STATE: 0}
             error = False
-        data, error = await self._async_todos_update_query(key, error)
+        data, error = await self._async_todos_update_query(key, error, response)
         if not error:
             self._data[entity_key][ATTR_DATA] = await self.hass.async_add_executor_job(
-                list, data
+                _build_todo_records, key[CONF_O365_TASK_FOLDER], data
             )
 
         self._data[entity_key][ATTR_ERROR] = error
 
-    async def _async_todos_update_query(self, key, error):
+    async def _async_todos_update_query(self, key, error, response):
         data = None
         o365_task = key[CONF_O365_TASK_FOLDER]
-        full_query = build_todo_query(key, o365_task)
         name = key[CONF_NAME]
 
         try:
-            data = await self.hass.async_add_executor_job(  # pylint: disable=no-member
-                ft.partial(o365_task.get_tasks, batch=100, query=full_query)
-            )
+            if self._todo_delta:
+                data = await self._async_todos_delta_query(key, o365_task)
+            elif response is not None:
+                response.raise_for_status()
+                data = response.json().get("value", [])
+                # Batched responses are a single page, so read the rest directly
+                if next_link := response.json().get("@odata.nextLink"):
+                    data = data + await self.hass.async_add_executor_job(
+                        get_all_items, self._account.con, next_link, None
+                    )
+            else:
+                # Fetched as json, rather than as tasks, so that each etag is kept
+                data = await self.hass.async_add_executor_job(
+                    get_all_items, self._account.con, *_build_todos_request(key)
+                )
             if error:
                 _LOGGER.info("O365 Task list reconnected for: %s", name)
                 error = False
@@ -367,15 +550,32 @@ class O365SensorCordinator(DataUpdateCoordinator):
 
         return data, error
 
-    async def _async_auto_reply_update(self, key):
+    async def _async_todos_delta_query(self, key, o365_task):
+        url = o365_task.build_url(
+            GRAPH_ENDPOINT_TASKS_DELTA.format(folder_id=o365_task.folder_id)
+        )
+        tasks = await self._todo_delta.async_sync(
+            self._account.con, o365_task.folder_id, url
+        )
+        return filter_todos(key, tasks.values())
+
+    async def _async_auto_reply_update(self, key, response=None):
         """Update state."""
         entity_key = key[CONF_ENTITY_KEY]
-        if data := await self.hass.async_add_executor_job(
-            self._account.mailbox().get_settings
-        ):
+        mailbox = self._account.mailbox()
+        if response is not None:
+            response.raise_for_status()
+            data = build_api_object(
+                mailbox, mailbox.mailbox_settings_constructor, response.json()
+            )
+        else:
+            data = await self.hass.async_add_executor_job(mailbox.get_settings)
+        if data:
             self._data[entity_key] = {
                 ATTR_STATE: data.automaticrepliessettings.status.value,
-                ATTR_AUTOREPLIESSETTINGS: data.automaticrepliessettings,
+                ATTR_AUTOREPLIESSETTINGS: build_auto_reply_record(
+                    data.automaticrepliessettings
+                ),
             }
 
 
@@ -389,7 +589,8 @@ class O365EmailCordinator(DataUpdateCoordinator):
             _LOGGER,
             # Name of the data. For logging purposes.
             name="O365 Email",
-            # Polling interval. Will only be polled if there are subscribers.
+            # Polling interval is set from the keys once they are known.
+            # Will only be polled if there are subscribers.
             update_interval=timedelta(seconds=30),
         )
         self._config = config
@@ -402,14 +603,45 @@ class O365EmailCordinator(DataUpdateCoordinator):
         )
         self._chat_members = {}
         self._ent_reg = entity_registry.async_get(hass)
+        self._scheduler = O365UpdateScheduler()
+        self._changes = O365ChangeTracker()
+        self._email_delta = (
+            O365DeltaStore(hass, config, JSON_EMAIL_DELTA_FILENAME)
+            if config[CONF_EMAIL_DELTA_SYNC]
+            else None
+        )
+        self._snapshot = (
+            O365SnapshotStore(hass, self._account_name, "email")
+            if config[CONF_FAST_START]
+            else None
+        )
+        self._mail_folder_ids = None
+        self._message_attachments = {}
 
     async def async_setup_entries(self):
         """Do the initial setup of the entities."""
         email_keys = await self._async_email_sensors()
         query_keys = await self._async_query_sensors()
         self._keys = email_keys + query_keys
+        self.update_interval = self._scheduler.update_interval(self._keys)
         return self._keys
 
+    def data_version(self, entity_key):
+        """Return a version of the key's data that changes when the data does."""
+        return self._changes.version(entity_key)
+
+    async def async_restore_snapshot(self):
+        """Use the data saved by the last run until the first refresh."""
+        if not self._snapshot:
+            return False
+        data = await self._snapshot.async_load(self._keys)
+        if data is None:
+            return False
+        self._data = data
+        self._changes.keys_updated(self._keys, data)
+        self.async_set_updated_data(data)
+        return True
+
     async def _async_email_sensors(self):
         email_sensors = self._config.get(CONF_EMAIL_SENSORS, [])
         keys = []
@@ -428,6 +660,10 @@ class O365EmailCordinator(DataUpdateCoordinator):
                     CONF_NAME: name,
                     CONF_ENTITY_TYPE: SENSOR_EMAIL,
                     CONF_QUERY: build_inbox_query(mail_folder, sensor_conf),
+                    CONF_MAIL_FILTER: build_inbox_filter(sensor_conf),
+                    CONF_UPDATE_INTERVAL: timedelta(
+                        seconds=sensor_conf.get(CONF_UPDATE_INTERVAL)
+                    ),
                 }
 
                 # Renames unique id to ensure uniqueness - To be deleted in early 2025
@@ -462,6 +698,10 @@ class O365EmailCordinator(DataUpdateCoordinator):
                     CONF_NAME: name,
                     CONF_ENTITY_TYPE: SENSOR_EMAIL,
                     CONF_QUERY: build_query_query(mail_folder, sensor_conf),
+                    CONF_MAIL_FILTER: build_query_filter(sensor_conf),
+                    CONF_UPDATE_INTERVAL: timedelta(
+                        seconds=sensor_conf.get(CONF_UPDATE_INTERVAL)
+                    ),
                 }
 
                 # Renames unique id to ensure uniqueness - To be deleted in early 2025
@@ -492,6 +732,15 @@ class O365EmailCordinator(DataUpdateCoordinator):
     async def _async_get_configured_mail_folder(
         self, mail_folder_conf, mailbox, sensor_type
     ):
+        folder_ids = await self._async_get_mail_folder_ids()
+        if folder_id := folder_ids.get(mail_folder_conf):
+            _LOGGER.debug("Get folder %s - cached - %s", mail_folder_conf, folder_id)
+            return mailbox.folder_constructor(
+                parent=mailbox,
+                name=mail_folder_conf.split("/")[-1],
+                folder_id=folder_id,
+            )
+
         mail_folder = mailbox
         _LOGGER.debug("Get folder %s - start", mail_folder_conf)
 
@@ -513,20 +762,216 @@ class O365EmailCordinator(DataUpdateCoordinator):
                 return None
 
         _LOGGER.debug("Get folder %s - finish ", mail_folder_conf)
+        folder_ids[mail_folder_conf] = mail_folder.folder_id
+        await self._async_save_mail_folder_ids()
         return mail_folder
 
+    async def _async_get_mail_folder_ids(self):
+        """Get the cached folder ids, by folder path, for this account."""
+        if self._mail_folder_ids is None:
+            self._mail_folder_ids = await self.hass.async_add_executor_job(
+                load_json_file, self._mail_folders_path()
+            )
+        return self._mail_folder_ids.setdefault(self._account_name, {})
+
+    async def _async_save_mail_folder_ids(self):
+        await self.hass.async_add_executor_job(
+            save_json_file, self._mail_folders_path(), self._mail_folder_ids
+        )
+
+    def _mail_folders_path(self):
+        return build_config_file_path(
+            self.hass, build_yaml_filename(self._config, JSON_MAIL_FOLDERS_FILENAME)
+        )
+
+    async def _async_refresh_mail_folder(self, keys, err):
+        """Resolve the folder again if its cached id is no longer found."""
+        mail_folder_conf = keys[0][CONF_SENSOR_CONF].get(CONF_MAIL_FOLDER)
+        if (
+            not mail_folder_conf
+            or err.response is None
+            or err.response.status_code != 404
+        ):
+            return False
+
+        folder_ids = await self._async_get_mail_folder_ids()
+        folder_ids.pop(mail_folder_conf, None)
+        _LOGGER.info("Mail folder %s not found, resolving again", mail_folder_conf)
+        sensor_type = (
+            CONF_QUERY_SENSORS
+            if keys[0][CONF_SENSOR_CONF] in self._config.get(CONF_QUERY_SENSORS, [])
+            else CONF_EMAIL_SENSORS
+        )
+        mail_folder = await self._async_get_configured_mail_folder(
+            mail_folder_conf, self._account.mailbox(), sensor_type
+        )
+        if not mail_folder:
+            return False
+        for key in keys:
+            key[CONF_O365_MAIL_FOLDER] = mail_folder
+        return True
+
     async def _async_update_data(self):
-        _LOGGER.debug(
-            "Doing %s email update(s) for: %s", len(self._keys), self._account_name
+        now = dt_util.utcnow()
+        keys = self._scheduler.due_keys(self._keys, now)
+        _LOGGER.debug("Doing %s email update(s) for: %s", len(keys), self._account_name)
+
+        if self._email_delta:
+            await self._async_email_delta_update(keys)
+        else:
+            # Sensors without a filter all read the newest messages of the folder,
+            # while those with one use their own query
+            single_keys = [key for key in keys if key[CONF_MAIL_FILTER]]
+            for folder_keys in _group_keys_by_folder(
+                key for key in keys if not key[CONF_MAIL_FILTER]
+            ).values():
+                if len(folder_keys) > 1:
+                    await self._async_email_shared_update(folder_keys)
+                else:
+                    single_keys.extend(folder_keys)
+            responses = await self._async_batch_responses(single_keys)
+            for key in single_keys:
+                await self._async_email_update(key, responses.get(key[CONF_ENTITY_KEY]))
+        for key in keys:
+            self._scheduler.key_updated(key, now)
+
+        self._changes.keys_updated(keys, self._data)
+        if self._snapshot:
+            self._snapshot.async_save(self._data)
+        self.update_interval = self._scheduler.next_interval(
+            self._keys, dt_util.utcnow()
+        )
+        return self._data
+
+    async def _async_email_shared_update(self, folder_keys):
+        """Fetch the newest messages of the folder once for every sensor."""
+        mail_folder = folder_keys[0][CONF_O365_MAIL_FOLDER]
+        selects, _ = self._build_folder_selects(mail_folder)
+        top = max(key[CONF_SENSOR_CONF].get(CONF_MAX_ITEMS, 5) for key in folder_keys)
+        url = mail_folder.build_url(
+            GRAPH_ENDPOINT_MAIL_FOLDER_MESSAGES.format(folder_id=mail_folder.folder_id)
         )
+        params = {
+            "$top": top,
+            "$orderby": "receivedDateTime desc",
+            "$select": ",".join(sorted(selects)),
+        }
+        try:
+            response = await self.hass.async_add_executor_job(
+                ft.partial(self._account.con.get, url, params=params)
+            )
+        except HTTPError as err:
+            if not await self._async_refresh_mail_folder(folder_keys, err):
+                raise
+            # Fetched from the resolved folder on the next update
+            return
+        messages = response.json().get("value", [])
+
+        for key in folder_keys:
+            self._data[key[CONF_ENTITY_KEY]] = {
+                ATTR_DATA: await self.hass.async_add_executor_job(
+                    _build_messages,
+                    key,
+                    _select_messages(key, messages),
+                    key[CONF_SENSOR_CONF].get(CONF_DOWNLOAD_ATTACHMENTS),
+                )
+            }
 
+    async def _async_email_delta_update(self, keys):
+        """Sync each folder once, then filter its messages for each sensor."""
+        for folder_id, folder_keys in _group_keys_by_folder(keys).items():
+            mail_folder = folder_keys[0][CONF_O365_MAIL_FOLDER]
+            url, params = self._build_delta_request(mail_folder)
+            try:
+                messages = await self._email_delta.async_sync(
+                    self._account.con, folder_id, url, params
+                )
+            except HTTPError as err:
+                if not await self._async_refresh_mail_folder(folder_keys, err):
+                    raise
+                # Synced from the resolved folder on the next update
+                continue
+
+            cached_attachments = self._message_attachments.get(folder_id, {})
+            attachments = {}
+            for key in folder_keys:
+                matches = _select_messages(key, messages.values())
+                if key[CONF_SENSOR_CONF].get(CONF_DOWNLOAD_ATTACHMENTS):
+                    # Delta queries cannot return attachments, so they are fetched
+                    # for just the messages the sensor shows
+                    matches = await self.hass.async_add_executor_job(
+                        _add_message_attachments,
+                        mail_folder,
+                        self._account.con,
+                        matches,
+                        cached_attachments,
+                        attachments,
+                    )
+                self._data[key[CONF_ENTITY_KEY]] = {
+                    ATTR_DATA: await self.hass.async_add_executor_job(
+                        _build_messages, key, matches
+                    )
+                }
+            self._message_attachments[folder_id] = attachments
+
+    def _build_delta_request(self, mail_folder):
+        """Build the delta query covering every sensor on the folder."""
+        selects, _ = self._build_folder_selects(mail_folder)
+        url = mail_folder.build_url(
+            GRAPH_ENDPOINT_MAIL_FOLDER_MESSAGES_DELTA.format(
+                folder_id=mail_folder.folder_id
+            )
+        )
+        window_start = _mail_delta_window_start(dt_util.utcnow())
+        return url, {
+            "$select": ",".join(sorted(selects)),
+            "$filter": f"receivedDateTime ge {window_start:%Y-%m-%dT%H:%M:%SZ}",
+        }
+
+    def _build_folder_selects(self, mail_folder):
+        """Build the fields needed by every sensor on the folder."""
+        selects = set()
+        download_attachments = False
         for key in self._keys:
-            await self._async_email_update(key)
+            if key[CONF_O365_MAIL_FOLDER].folder_id != mail_folder.folder_id:
+                continue
+            sensor_conf = key[CONF_SENSOR_CONF]
+            selects.update(key[CONF_QUERY].get_selects().split(","))
+            if sensor_conf.get(CONF_BODY_CONTAINS) is not None:
+                selects.add("body")
+            if sensor_conf.get(CONF_DOWNLOAD_ATTACHMENTS):
+                download_attachments = True
 
-        return self._data
+        # Attachments are downloaded separately for the messages that are used
+        selects.discard("attachments")
+        return selects, download_attachments
 
-    async def _async_email_update(self, key):
+    async def _async_batch_responses(self, keys):
+        if not self._config[CONF_BATCH_REQUESTS]:
+            return {}
+        requests = {
+            key[CONF_ENTITY_KEY]: self._build_batch_request(key) for key in keys
+        }
+        return await async_batch_get(self.hass, self._account, requests)
+
+    def _build_batch_request(self, key):
+        mail_folder = key[CONF_O365_MAIL_FOLDER]
+        max_items = key[CONF_SENSOR_CONF].get(CONF_MAX_ITEMS, 5)
+        url = mail_folder.build_url(
+            GRAPH_ENDPOINT_MAIL_FOLDER_MESSAGES.format(folder_id=mail_folder.folder_id)
+        )
+        return url, {"$top": max_items} | key[CONF_QUERY].as_params()
+
+    async def _async_email_update(self, key, response=None):
         """Update code."""
+        try:
+            await self._async_email_update_key(key, response)
+        except HTTPError as err:
+            if not await self._async_refresh_mail_folder([key], err):
+                raise
+            await self._async_email_update_key(key, None)
+
+    async def _async_email_update_key(self, key, response):
 
         sensor_conf = key[CONF_SENSOR_CONF]
         download_attachments = sensor_conf.get(CONF_DOWNLOAD_ATTACHMENTS)
@@ -535,16 +980,30 @@ class O365EmailCordinator(DataUpdateCoordinator):
         entity_key = key[CONF_ENTITY_KEY]
         query = key[CONF_QUERY]
 
-        data = await self.hass.async_add_executor_job(  # pylint: disable=no-member
-            ft.partial(
-                mail_folder.get_messages,
-                limit=max_items,
-                query=query,
-                download_attachments=download_attachments,
+        if response is not None:
+            response.raise_for_status()
+            data = (
+                build_api_object(
+                    mail_folder,
+                    mail_folder.message_constructor,
+                    message,
+                    download_attachments=download_attachments,
+                )
+                for message in response.json().get("value", [])
+            )
+        else:
+            data = await self.hass.async_add_executor_job(  # pylint: disable=no-member
+                ft.partial(
+                    mail_folder.get_messages,
+                    limit=max_items,
+                    query=query,
+                    download_attachments=download_attachments,
+                )
             )
-        )
         self._data[entity_key] = {
-            ATTR_DATA: await self.hass.async_add_executor_job(list, data)
+            ATTR_DATA: await self.hass.async_add_executor_job(
+                _build_mail_records, sensor_conf, data
+            )
         }
 
 
@@ -560,3 +1019,114 @@ def _build_entity_id(hass, entity_id_format, name):
 async def _async_delete_redundant_sensors(ent_reg, unique_id):
     if entity_id := ent_reg.async_get_entity_id("sensor", DOMAIN, unique_id):
         ent_reg.async_remove(entity_id)
+
+
+def _mail_delta_window_start(now):
+    """Return the oldest receivedDateTime held by the email delta sync.
+
+    The window moves on in whole steps, each one starting a new full sync, so
+    between one and two windows of mail are held.
+    """
+    window = timedelta(days=MAIL_DELTA_WINDOW_DAYS)
+    epoch = dt_util.utc_from_timestamp(0)
+    return epoch + ((now - epoch) // window - 1) * window
+
+
+def _add_message_attachments(mail_folder, con, messages, cached, attachments):
+    """Add attachments to the messages, fetching those not held in cached.
+
+    The attachments used are recorded in attachments, by message id.
+    """
+    with_attachments = []
+    for message in messages:
+        if message.get("hasAttachments"):
+            message_id = message["id"]
+            if message_id not in attachments:
+                attachments[message_id] = (
+                    cached[message_id]
+                    if message_id in cached
+                    else _get_message_attachments(mail_folder, con, message_id)
+                )
+            message = message | {"attachments": attachments[message_id]}
+        with_attachments.append(message)
+    return with_attachments
+
+
+def _get_message_attachments(mail_folder, con, message_id):
+    url = mail_folder.build_url(
+        GRAPH_ENDPOINT_MESSAGE_ATTACHMENTS.format(message_id=message_id)
+    )
+    response = con.get(url, params={"$select": "id,name,contentType,size,isInline"})
+    return response.json().get("value", [])
+
+
+def _build_todos_request(key):
+    o365_task = key[CONF_O365_TASK_FOLDER]
+    url = o365_task.build_url(
+        GRAPH_ENDPOINT_TASKS.format(folder_id=o365_task.folder_id)
+    )
+    return url, {"$top": 100} | build_todo_query(key, o365_task).as_params()
+
+
+def _build_todo_records(o365_task, tasks):
+    return [
+        build_todo_record(
+            build_api_object(
+                o365_task,
+                o365_task.task_constructor,
+                task,
+                folder_id=o365_task.folder_id,
+            ),
+            task.get("@odata.etag"),
+        )
+        for task in tasks
+    ]
+
+
+def _replace_todos(todos, records):
+    task_ids = {todo.task_id for todo in todos}
+    new_todos = [records.get(todo.task_id, todo) for todo in todos]
+    new_todos.extend(
+        record for task_id, record in records.items() if task_id not in task_ids
+    )
+    return [todo for todo in new_todos if todo]
+
+
+def _group_keys_by_folder(keys):
+    folders = {}
+    for key in keys:
+        folders.setdefault(key[CONF_O365_MAIL_FOLDER].folder_id, []).append(key)
+    return folders
+
+
+def _select_messages(key, messages):
+    """Select the newest messages matching the sensor's filter."""
+    max_items = key[CONF_SENSOR_CONF].get(CONF_MAX_ITEMS, 5)
+    if mail_filter := key[CONF_MAIL_FILTER]:
+        messages = filter(mail_filter, messages)
+    return heapq.nlargest(
+        max_items,
+        messages,
+        key=lambda message: message.get("receivedDateTime", ""),
+    )
+
+
+def _build_messages(key, messages, download_attachments=False):
+    """Build the sensor's records for the selected messages."""
+    mail_folder = key[CONF_O365_MAIL_FOLDER]
+    return _build_mail_records(
+        key[CONF_SENSOR_CONF],
+        (
+            build_api_object(
+                mail_folder,
+                mail_folder.message_constructor,
+                message,
+                download_attachments=download_attachments,
+            )
+            for message in messages
+        ),
+    )
+
+
+def _build_mail_records(sensor_conf, messages):
+    return [build_mail_record(message, sensor_conf) for message in messages]
@@ -0,0 +1,112 @@
+"""Incremental sync using Microsoft Graph delta queries."""
+
+import asyncio
+import logging
+
+from requests.exceptions import HTTPError
+
+from ..utils.filemgmt import (
+    build_config_file_path,
+    build_yaml_filename,
+    load_json_file,
+    save_json_file,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DELTA_LINK = "delta_link"
+ITEMS = "items"
+SOURCE = "source"
+
+
+def fetch_delta(con, url, params=None):
+    """Follow a delta query to its last page, returning the changes and delta link."""
+    changes = []
+    delta_link = None
+    while url:
+        data = con.get(url, params=params).json()
+        changes.extend(data.get("value", []))
+        url = data.get("@odata.nextLink")
+        params = None
+        delta_link = data.get("@odata.deltaLink", delta_link)
+    return changes, delta_link
+
+
+def _sync_collection(con, source, collection):
+    """Apply a delta query to a copy of the collection.
+
+    Returns None when nothing has changed.
+    """
+    items = collection[ITEMS]
+    delta_link = collection[DELTA_LINK] if collection.get(SOURCE) == source else None
+    if delta_link:
+        try:
+            changes, new_delta_link = fetch_delta(con, delta_link)
+        except HTTPError as err:
+            if err.response is None or err.response.status_code != 410:
+                raise
+            # The delta token has expired, so start again from a full sync
+            _LOGGER.info("Delta token expired, resyncing - %s", source[0])
+            delta_link = None
+    if not delta_link:
+        changes, new_delta_link = fetch_delta(con, *source)
+        items = {}
+    elif not changes:
+        return None
+
+    items = dict(items)
+    for item in changes:
+        if "@removed" in item:
+            items.pop(item["id"], None)
+            continue
+        items[item["id"]] = items.get(item["id"], {}) | item
+    return {ITEMS: items, DELTA_LINK: new_delta_link or delta_link, SOURCE: source}
+
+
+class O365DeltaStore:
+    """Local copies of Graph collections, kept current with delta queries."""
+
+    def __init__(self, hass, config, filename):
+        """Initialise the store."""
+        self._hass = hass
+        self._path = build_config_file_path(hass, build_yaml_filename(config, filename))
+        self._collections = None
+        self._lock = asyncio.Lock()
+
+    async def async_sync(self, con, collection_id, url, params=None):
+        """Apply the latest changes to a collection, returning its items by id."""
+        await self._async_load()
+        collection = self._collections.get(collection_id) or {
+            ITEMS: {},
+            DELTA_LINK: None,
+        }
+        # Held as a list so that it compares equal after a round trip to json
+        source = [url, params]
+        new_collection = await self._hass.async_add_executor_job(
+            _sync_collection, con, source, collection
+        )
+        if new_collection is None:
+            return collection[ITEMS]
+
+        # Collections are replaced, never changed, so a shallow copy is safe to save
+        self._collections[collection_id] = new_collection
+        snapshot = dict(self._collections)
+        async with self._lock:
+            await self._hass.async_add_executor_job(
+                save_json_file, self._path, snapshot
+            )
+        return new_collection[ITEMS]
+
+    async def async_get_params(self, collection_id):
+        """Get the params a collection was last synced with."""
+        await self._async_load()
+        if source := self._collections.get(collection_id, {}).get(SOURCE):
+            return source[1]
+        return None
+
+    async def _async_load(self):
+        async with self._lock:
+            if self._collections is None:
+                self._collections = await self._hass.async_add_executor_job(
+                    load_json_file, self._path
+                )
@@ -0,0 +1,45 @@
+"""Per-key update scheduling for the coordinators."""
+
+from datetime import timedelta
+
+from ..const import CONF_ENTITY_KEY, CONF_UPDATE_INTERVAL
+
+# Coordinator ticks can fire up to a second early
+_TOLERANCE = timedelta(seconds=1)
+
+
+class O365UpdateScheduler:
+    """Track when each coordinator key is next due for an update."""
+
+    def __init__(self):
+        """Initialise the scheduler."""
+        self._next_update = {}
+
+    def update_interval(self, keys):
+        """Return the coordinator interval until the first keys have updated."""
+        if not keys:
+            return None
+        return min(key[CONF_UPDATE_INTERVAL] for key in keys)
+
+    def next_interval(self, keys, now):
+        """Return the coordinator interval until the earliest key is due."""
+        if not keys:
+            return None
+        next_due = min(self._next_update.get(key[CONF_ENTITY_KEY], now) for key in keys)
+        return max(next_due - now, _TOLERANCE)
+
+    def due_keys(self, keys, now):
+        """Return the keys due for update at this point in time."""
+        return [
+            key
+            for key in keys
+            if self._next_update.get(key[CONF_ENTITY_KEY], now) <= now + _TOLERANCE
+        ]
+
+    def key_updated(self, key, now):
+        """Record that the key was updated."""
+        self._next_update[key[CONF_ENTITY_KEY]] = now + key[CONF_UPDATE_INTERVAL]
+
+    def force_update(self, entity_key):
+        """Make the key due on the next cycle."""
+        self._next_update.pop(entity_key, None)
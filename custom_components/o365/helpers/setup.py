@@ -10,16 +10,22 @@ from ..const import (
     CONF_ACCOUNT,
     CONF_ACCOUNT_NAME,
     CONF_AUTO_REPLY_SENSORS,
+    CONF_BATCH_REQUESTS,
+    CONF_CALENDAR_DELTA_SYNC,
+    CONF_CALENDAR_LOCAL_RECURRENCE,
     CONF_CHAT_SENSORS,
     CONF_CLIENT_ID,
     CONF_CONFIG_TYPE,
     CONF_COORDINATOR_EMAIL,
     CONF_COORDINATOR_SENSORS,
+    CONF_EMAIL_DELTA_SYNC,
     CONF_EMAIL_SENSORS,
     CONF_ENABLE_CALENDAR,
     CONF_ENABLE_UPDATE,
+    CONF_FAST_START,
     CONF_KEYS_EMAIL,
     CONF_KEYS_SENSORS,
+    CONF_MAX_CONCURRENT_UPDATES,
     CONF_PERMISSIONS,
     CONF_QUERY_SENSORS,
     CONF_STATUS_SENSORS,
@@ -56,6 +62,14 @@ async def do_setup(hass, config, account, account_name, conf_type, perms):
         CONF_ENABLE_CALENDAR: enable_calendar,
         CONF_TRACK_NEW_CALENDAR: config.get(CONF_TRACK_NEW_CALENDAR, True),
         CONF_ACCOUNT_NAME: config.get(CONF_ACCOUNT_NAME, ""),
+        CONF_MAX_CONCURRENT_UPDATES: config.get(CONF_MAX_CONCURRENT_UPDATES, 4),
+        CONF_BATCH_REQUESTS: config.get(CONF_BATCH_REQUESTS, False),
+        CONF_EMAIL_DELTA_SYNC: config.get(CONF_EMAIL_DELTA_SYNC, False),
+        CONF_CALENDAR_DELTA_SYNC: config.get(CONF_CALENDAR_DELTA_SYNC, False),
+        CONF_CALENDAR_LOCAL_RECURRENCE: config.get(
+            CONF_CALENDAR_LOCAL_RECURRENCE, False
+        ),
+        CONF_FAST_START: config.get(CONF_FAST_START, False),
         CONF_CONFIG_TYPE: conf_type,
         CONF_PERMISSIONS: perms,
     }
@@ -84,7 +98,7 @@ async def _async_sensor_setup(hass, account_config):
     sensor_coordinator = O365SensorCordinator(hass, account_config)
     sensor_keys = await sensor_coordinator.async_setup_entries()
     if sensor_keys:
-        await sensor_coordinator.async_config_entry_first_refresh()
+        await _async_first_refresh(hass, sensor_coordinator)
     _LOGGER.debug("Sensor setup - finish")
     return {"coordinator": sensor_coordinator, "keys": sensor_keys}
 
@@ -94,11 +108,22 @@ async def _async_email_setup(hass, account_config):
     email_coordinator = O365EmailCordinator(hass, account_config)
     email_keys = await email_coordinator.async_setup_entries()
     if email_keys:
-        await email_coordinator.async_config_entry_first_refresh()
+        await _async_first_refresh(hass, email_coordinator)
     _LOGGER.debug("Email setup - finish")
     return {"coordinator": email_coordinator, "keys": email_keys}
 
 
+async def _async_first_refresh(hass, coordinator):
+    if await coordinator.async_restore_snapshot():
+        # Entities start from the saved data while the live data loads. Only the
+        # first data update is skipped, setting up the keys still calls Graph.
+        hass.async_create_background_task(
+            coordinator.async_refresh(), f"{coordinator.name} first refresh"
+        )
+        return
+    await coordinator.async_config_entry_first_refresh()
+
+
 def _load_platforms(hass, account_name, config, account_config):
     if account_config[CONF_ENABLE_CALENDAR]:
         hass.async_create_task(
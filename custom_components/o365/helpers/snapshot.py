@@ -0,0 +1,91 @@
+"""Coordinator data saved between runs, for a fast start."""
+
+from datetime import datetime
+
+from homeassistant.helpers.storage import Store
+from O365.mailbox import ExternalAudience
+
+from ..const import (
+    CONF_ENTITY_KEY,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_KEY,
+    SNAPSHOT_STORAGE_VERSION,
+)
+from ..todo import O365TodoRecord
+from ..utils.utils import O365AutoReplyRecord, O365MailFlag, O365MailRecord
+
+DATETIME = "__datetime__"
+ENUM = "__enum__"
+RECORD = "__record__"
+TUPLE = "__tuple__"
+VALUE = "value"
+
+_ENUMS = {ExternalAudience.__name__: ExternalAudience}
+_RECORDS = {
+    record.__name__: record
+    for record in (O365AutoReplyRecord, O365MailFlag, O365MailRecord, O365TodoRecord)
+}
+
+
+class O365SnapshotStore:
+    """The last data of a coordinator, held in .storage."""
+
+    def __init__(self, hass, account_name, name):
+        """Initialise the store."""
+        self._store = Store(
+            hass,
+            SNAPSHOT_STORAGE_VERSION,
+            SNAPSHOT_STORAGE_KEY.format(account_name, name),
+        )
+
+    async def async_load(self, keys):
+        """Load the saved data, or None if it does not cover every key."""
+        snapshot = await self._store.async_load()
+        if not snapshot or any(key[CONF_ENTITY_KEY] not in snapshot for key in keys):
+            return None
+        try:
+            return {
+                key[CONF_ENTITY_KEY]: _decode(snapshot[key[CONF_ENTITY_KEY]])
+                for key in keys
+            }
+        except (KeyError, TypeError, ValueError):
+            # Saved by a release whose records no longer match
+            return None
+
+    def async_save(self, data):
+        """Save the data once updates have settled."""
+        self._store.async_delay_save(lambda: _encode(data), SNAPSHOT_SAVE_DELAY)
+
+
+def _encode(value):
+    """Convert the data to json, tagging the types json cannot hold."""
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if type(value) in _RECORDS.values():
+        return {RECORD: type(value).__name__, VALUE: [_encode(item) for item in value]}
+    if isinstance(value, tuple):
+        return {TUPLE: [_encode(item) for item in value]}
+    if isinstance(value, datetime):
+        return {DATETIME: value.isoformat()}
+    if type(value) in _ENUMS.values():
+        return {ENUM: type(value).__name__, VALUE: value.value}
+    return value
+
+
+def _decode(value):
+    """Convert the json back to the data."""
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if RECORD in value:
+        return _RECORDS[value[RECORD]](*map(_decode, value[VALUE]))
+    if TUPLE in value:
+        return tuple(map(_decode, value[TUPLE]))
+    if DATETIME in value:
+        return datetime.fromisoformat(value[DATETIME])
+    if ENUM in value:
+        return _ENUMS[value[ENUM]](value[VALUE])
+    return {key: _decode(item) for key, item in value.items()}
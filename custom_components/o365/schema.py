@@ -63,37 +63,48 @@ from .const import (
     ATTR_START,
     ATTR_SUBJECT,
     ATTR_TODO_ID,
+    ATTR_TODO_IDS,
     ATTR_TYPE,
     ATTR_ZIP_ATTACHMENTS,
     ATTR_ZIP_NAME,
+    CALENDAR_FILTER_FIELDS,
     CONF_ACCOUNT_NAME,
     CONF_ACCOUNTS,
     CONF_ALT_AUTH_METHOD,
     CONF_AUTO_REPLY_SENSORS,
     CONF_BASIC_CALENDAR,
+    CONF_BATCH_REQUESTS,
     CONF_BODY_CONTAINS,
     CONF_CAL_ID,
+    CONF_CALENDAR_DELTA_SYNC,
+    CONF_CALENDAR_LOCAL_RECURRENCE,
     CONF_CHAT_SENSORS,
     CONF_CLIENT_ID,
     CONF_CLIENT_SECRET,
+    CONF_DELTA_SYNC,
     CONF_DEVICE_ID,
     CONF_DOWNLOAD_ATTACHMENTS,
     CONF_DUE_HOURS_BACKWARD_TO_GET,
     CONF_DUE_HOURS_FORWARD_TO_GET,
+    CONF_EMAIL_DELTA_SYNC,
     CONF_EMAIL_SENSORS,
     CONF_ENABLE_CALENDAR,
     CONF_ENABLE_UPDATE,
     CONF_ENTITIES,
     CONF_EXCLUDE,
+    CONF_FAST_START,
     CONF_GROUPS,
     CONF_HAS_ATTACHMENT,
     CONF_HOURS_BACKWARD_TO_GET,
     CONF_HOURS_FORWARD_TO_GET,
     CONF_HTML_BODY,
+    CONF_HTML_BODY_MAX_SIZE,
     CONF_IMPORTANCE,
+    CONF_INCLUDE,
     CONF_IS_UNREAD,
     CONF_MAIL_FOLDER,
     CONF_MAIL_FROM,
+    CONF_MAX_CONCURRENT_UPDATES,
     CONF_MAX_ITEMS,
     CONF_MAX_RESULTS,
     CONF_QUERY_SENSORS,
@@ -108,6 +119,7 @@ from .const import (
     CONF_TRACK,
     CONF_TRACK_NEW,
     CONF_TRACK_NEW_CALENDAR,
+    CONF_UPDATE_INTERVAL,
     CONF_URL,
     CONF_YAML_TASK_LIST_ID,
     CONTENT_TYPES,
@@ -154,7 +166,9 @@ EMAIL_SENSOR = vol.Schema(
         vol.Optional(CONF_IS_UNREAD): bool,
         vol.Optional(CONF_DOWNLOAD_ATTACHMENTS, default=True): bool,
         vol.Optional(CONF_HTML_BODY, default=False): bool,
+        vol.Optional(CONF_HTML_BODY_MAX_SIZE): cv.positive_int,
         vol.Optional(CONF_SHOW_BODY, default=True): bool,
+        vol.Optional(CONF_UPDATE_INTERVAL, default=30): cv.positive_int,
     }
 )
 STATUS_SENSOR = vol.Schema(
@@ -163,6 +177,7 @@ STATUS_SENSOR = vol.Schema(
             vol.Required(CONF_NAME): cv.string,
             vol.Optional(CONF_ENABLE_UPDATE, None): bool,
             vol.Optional(CONF_EMAIL, None): cv.string,
+            vol.Optional(CONF_UPDATE_INTERVAL, default=30): cv.positive_int,
         },
         cv.has_at_most_one_key(CONF_ENABLE_UPDATE, CONF_EMAIL),
     )
@@ -171,11 +186,13 @@ CHAT_SENSOR = vol.Schema(
     {
         vol.Required(CONF_NAME): cv.string,
         vol.Optional(CONF_ENABLE_UPDATE, default=False): bool,
+        vol.Optional(CONF_UPDATE_INTERVAL, default=30): cv.positive_int,
     }
 )
 AUTO_REPLY_SENSOR = vol.Schema(
     {
         vol.Required(CONF_NAME): cv.string,
+        vol.Optional(CONF_UPDATE_INTERVAL, default=300): cv.positive_int,
     }
 )
 QUERY_SENSOR = vol.Schema(
@@ -192,7 +209,9 @@ QUERY_SENSOR = vol.Schema(
         vol.Exclusive(CONF_SUBJECT_IS, "subject_*"): cv.string,
         vol.Optional(CONF_DOWNLOAD_ATTACHMENTS, default=True): bool,
         vol.Optional(CONF_HTML_BODY, default=False): bool,
+        vol.Optional(CONF_HTML_BODY_MAX_SIZE): cv.positive_int,
         vol.Optional(CONF_SHOW_BODY, default=True): bool,
+        vol.Optional(CONF_UPDATE_INTERVAL, default=30): cv.positive_int,
     }
 )
 TODO_SENSOR = vol.Schema(
@@ -200,6 +219,8 @@ TODO_SENSOR = vol.Schema(
         vol.Required(CONF_ENABLED, default=False): bool,
         vol.Optional(CONF_TRACK_NEW, default=True): bool,
         vol.Optional(CONF_ENABLE_UPDATE, default=False): bool,
+        vol.Optional(CONF_UPDATE_INTERVAL, default=60): cv.positive_int,
+        vol.Optional(CONF_DELTA_SYNC, default=False): bool,
     }
 )
 
@@ -224,6 +245,14 @@ MULTI_ACCOUNT_SCHEMA = vol.Schema(
                     vol.Optional(CONF_TODO_SENSORS): TODO_SENSOR,
                     vol.Optional(CONF_AUTO_REPLY_SENSORS): [AUTO_REPLY_SENSOR],
                     vol.Optional(CONF_SHARED_MAILBOX, None): cv.string,
+                    vol.Optional(
+                        CONF_MAX_CONCURRENT_UPDATES, default=4
+                    ): cv.positive_int,
+                    vol.Optional(CONF_BATCH_REQUESTS, default=False): bool,
+                    vol.Optional(CONF_EMAIL_DELTA_SYNC, default=False): bool,
+                    vol.Optional(CONF_CALENDAR_DELTA_SYNC, default=False): bool,
+                    vol.Optional(CONF_CALENDAR_LOCAL_RECURRENCE, default=False): bool,
+                    vol.Optional(CONF_FAST_START, default=False): bool,
                 }
             ]
         )
@@ -342,6 +371,13 @@ TODO_SERVICE_COMPLETE_SCHEMA = {
     vol.Required(ATTR_TODO_ID): cv.string,
     vol.Required(ATTR_COMPLETED): bool,
 }
+TODO_SERVICE_DELETE_MANY_SCHEMA = {
+    vol.Required(ATTR_TODO_IDS): vol.All(cv.ensure_list, [cv.string]),
+}
+TODO_SERVICE_COMPLETE_MANY_SCHEMA = {
+    vol.Required(ATTR_TODO_IDS): vol.All(cv.ensure_list, [cv.string]),
+    vol.Required(ATTR_COMPLETED): bool,
+}
 
 AUTO_REPLY_SERVICE_ENABLE_SCHEMA = {
     vol.Required(ATTR_EXTERNALREPLY): cv.string,
@@ -354,6 +390,13 @@ AUTO_REPLY_SERVICE_ENABLE_SCHEMA = {
 AUTO_REPLY_SERVICE_DISABLE_SCHEMA = {}
 
 
+YAML_CALENDAR_FILTER_SCHEMA = vol.Schema(
+    {
+        vol.Optional(field): vol.All(cv.ensure_list, [cv.string])
+        for field in CALENDAR_FILTER_FIELDS
+    }
+)
+
 YAML_CALENDAR_ENTITY_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_NAME): cv.string,
@@ -361,7 +404,8 @@ YAML_CALENDAR_ENTITY_SCHEMA = vol.Schema(
         vol.Optional(CONF_HOURS_FORWARD_TO_GET, default=24): int,
         vol.Optional(CONF_HOURS_BACKWARD_TO_GET, default=0): int,
         vol.Optional(CONF_SEARCH): cv.string,
-        vol.Optional(CONF_EXCLUDE): [cv.string],
+        vol.Optional(CONF_INCLUDE): YAML_CALENDAR_FILTER_SCHEMA,
+        vol.Optional(CONF_EXCLUDE): vol.Any([cv.string], YAML_CALENDAR_FILTER_SCHEMA),
         vol.Optional(CONF_TRACK): cv.boolean,
         vol.Optional(CONF_MAX_RESULTS): cv.positive_int,
     }
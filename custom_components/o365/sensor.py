@@ -20,7 +20,6 @@ from .const import (
     CONF_KEYS_EMAIL,
     CONF_KEYS_SENSORS,
     CONF_PERMISSIONS,
-    CONF_SENSOR_CONF,
     CONF_STATUS_SENSORS,
     DOMAIN,
     PERM_CHAT_READWRITE,
@@ -108,7 +107,6 @@ def _email_entities(conf):
         O365MailSensor(
             email_coordinator,
             conf,
-            key[CONF_SENSOR_CONF],
             key[CONF_NAME],
             key[CONF_ENTITY_KEY],
             key[CONF_UNIQUE_ID],
@@ -1,14 +1,18 @@
 """Todo processing."""
 
+import functools as ft
 import logging
+import time
 from datetime import datetime, timedelta
+from typing import NamedTuple
 
 from homeassistant.components.todo import TodoItem, TodoListEntity
 from homeassistant.components.todo.const import TodoItemStatus, TodoListEntityFeature
 from homeassistant.const import CONF_ENABLED, CONF_NAME, CONF_UNIQUE_ID
-from homeassistant.exceptions import ServiceValidationError
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers import entity_platform
 from homeassistant.util import dt as dt_util
+from requests.exceptions import HTTPError, RetryError
 
 from .classes.entity import O365Entity
 from .const import (
@@ -46,11 +50,20 @@ from .const import (
     EVENT_NEW_TODO,
     EVENT_UNCOMPLETED_TODO,
     EVENT_UPDATE_TODO,
+    GRAPH_BATCH_MAX_REQUESTS,
+    GRAPH_ENDPOINT_TASK,
+    GRAPH_THROTTLED_STATUS_CODES,
     PERM_TASKS_READWRITE,
+    TODO_BATCH_RETRIES,
+    TODO_BATCH_RETRY_DEFAULT_WAIT,
+    TODO_BATCH_RETRY_MAX_WAIT,
     TODO_TODO,
 )
+from .helpers.batch import O365GraphBatch, build_api_object
 from .schema import (
+    TODO_SERVICE_COMPLETE_MANY_SCHEMA,
     TODO_SERVICE_COMPLETE_SCHEMA,
+    TODO_SERVICE_DELETE_MANY_SCHEMA,
     TODO_SERVICE_DELETE_SCHEMA,
     TODO_SERVICE_NEW_SCHEMA,
     TODO_SERVICE_UPDATE_SCHEMA,
@@ -135,6 +148,16 @@ async def _async_setup_task_services(hass, config, perms):
             TODO_SERVICE_COMPLETE_SCHEMA,
             "async_complete_todo",
         )
+        platform.async_register_entity_service(
+            "delete_todos",
+            TODO_SERVICE_DELETE_MANY_SCHEMA,
+            "async_delete_todos",
+        )
+        platform.async_register_entity_service(
+            "complete_todos",
+            TODO_SERVICE_COMPLETE_MANY_SCHEMA,
+            "async_complete_todos",
+        )
 
 
 class O365TodoList(O365Entity, TodoListEntity):  # pylint: disable=abstract-method
@@ -164,6 +187,8 @@ class O365TodoList(O365Entity, TodoListEntity):  # pylint: disable=abstract-meth
         self._state = None
         self._todo_items = None
         self._extra_attributes = None
+        self._formatted = {}
+        self._tasks = {}
         self._update_status(hass)
         if config.get(CONF_TODO_SENSORS).get(CONF_ENABLE_UPDATE):
             self._attr_supported_features = (
@@ -190,34 +215,46 @@ class O365TodoList(O365Entity, TodoListEntity):  # pylint: disable=abstract-meth
         return self._extra_attributes
 
     def _handle_coordinator_update(self) -> None:
-        self._update_status(self.hass)
-        self.async_write_ha_state()
+        # Tasks become overdue as the date changes
+        if self._data_changed(dt_util.utcnow().date()):
+            self._update_status(self.hass)
+            self.async_write_ha_state()
+
+    @property
+    def available(self):
+        """Todo list is available once its tasks have been read."""
+        return super().available and ATTR_DATA in self.coordinator.data[self.entity_key]
 
     def _update_status(self, hass):
+        if not self.available:
+            return
         todos = self.coordinator.data[self.entity_key][ATTR_DATA]
-        self._state = sum(not task.completed for task in todos)
-        self._todo_items = []
-        for todo in todos:
-            completed = (
-                TodoItemStatus.COMPLETED
-                if todo.completed
-                else TodoItemStatus.NEEDS_ACTION
-            )
-            self._todo_items.append(
-                TodoItem(
-                    uid=todo.task_id,
-                    summary=todo.subject,
-                    status=completed,
-                    description=todo.body,
-                    due=todo.due.date() if todo.due else None,
-                )
-            )
-
-            self._extra_attributes = self._update_extra_state_attributes(todos)
-
+        today = dt_util.utcnow().date()
+        formatted = {}
+        tasks = {}
+        todo_items = []
+        all_todos = []
+        overdue_todos = []
         todo_last_completed = self._zero_date
         todo_last_created = self._zero_date
         for todo in todos:
+            # Records are immutable, so an unchanged task reuses its formatting
+            if todo not in formatted:
+                formatted[todo] = self._formatted.get(todo) or self._format_todo(todo)
+            tasks[todo.task_id] = todo
+            todo_item, todo_attributes = formatted[todo]
+            todo_items.append(todo_item)
+            all_todos.append(todo_attributes)
+            if todo.due and todo.due.date() < today:
+                overdue_todo = {
+                    ATTR_SUBJECT: todo.subject,
+                    ATTR_TODO_ID: todo.task_id,
+                    ATTR_DUE: todo.due.date(),
+                }
+                if todo.is_reminder_on:
+                    overdue_todo[ATTR_REMINDER] = todo.reminder
+                overdue_todos.append(overdue_todo)
+
             if todo.completed and todo.completed > self.todo_last_completed:
                 _raise_event_external(
                     hass,
@@ -235,51 +272,48 @@ class O365TodoList(O365Entity, TodoListEntity):  # pylint: disable=abstract-meth
                 if todo.created > todo_last_created:
                     todo_last_created = todo.created
 
+        self._formatted = formatted
+        self._tasks = tasks
+        self._state = sum(not todo.completed for todo in todos)
+        self._todo_items = todo_items
+        self._extra_attributes = {ATTR_ALL_TODOS: all_todos}
+        if overdue_todos:
+            self._extra_attributes[ATTR_OVERDUE_TODOS] = overdue_todos
+
         if todo_last_completed > self._zero_date:
             self.todo_last_completed = todo_last_completed
         if todo_last_created > self._zero_date:
             self.todo_last_created = todo_last_created
 
-    def _update_extra_state_attributes(self, todos):
-        """Extra state attributes."""
-        all_todos = []
-        overdue_todos = []
-        for item in todos:
-            todo = {
-                ATTR_SUBJECT: item.subject,
-                ATTR_TODO_ID: item.task_id,
-                ATTR_STATUS: item.status,
-            }
-            if item.body:
-                todo[ATTR_DESCRIPTION] = item.body
-            if self._show_completed:
-                todo[ATTR_COMPLETED] = (
-                    item.completed.strftime(DATETIME_FORMAT)
-                    if item.completed
-                    else False
-                )
-            if item.due:
-                due = item.due.date()
-                todo[ATTR_DUE] = due
-                if due < dt_util.utcnow().date():
-                    overdue_todo = {
-                        ATTR_SUBJECT: item.subject,
-                        ATTR_TODO_ID: item.task_id,
-                        ATTR_DUE: due,
-                    }
-                    if item.is_reminder_on:
-                        overdue_todo[ATTR_REMINDER] = item.reminder
-                    overdue_todos.append(overdue_todo)
-
-            if item.is_reminder_on:
-                todo[ATTR_REMINDER] = item.reminder
-
-            all_todos.append(todo)
-
-        extra_attributes = {ATTR_ALL_TODOS: all_todos}
-        if overdue_todos:
-            extra_attributes[ATTR_OVERDUE_TODOS] = overdue_todos
-        return extra_attributes
+    def _format_todo(self, todo):
+        """Build the todo item and state attributes for a task."""
+        todo_item = TodoItem(
+            uid=todo.task_id,
+            summary=todo.subject,
+            status=(
+                TodoItemStatus.COMPLETED
+                if todo.completed
+                else TodoItemStatus.NEEDS_ACTION
+            ),
+            description=todo.body,
+            due=todo.due.date() if todo.due else None,
+        )
+        todo_attributes = {
+            ATTR_SUBJECT: todo.subject,
+            ATTR_TODO_ID: todo.task_id,
+            ATTR_STATUS: todo.status,
+        }
+        if todo.body:
+            todo_attributes[ATTR_DESCRIPTION] = todo.body
+        if self._show_completed:
+            todo_attributes[ATTR_COMPLETED] = (
+                todo.completed.strftime(DATETIME_FORMAT) if todo.completed else False
+            )
+        if todo.due:
+            todo_attributes[ATTR_DUE] = todo.due.date()
+        if todo.is_reminder_on:
+            todo_attributes[ATTR_REMINDER] = todo.reminder
+        return todo_item, todo_attributes
 
     async def async_create_todo_item(self, item: TodoItem) -> None:
         """Add an item to the To-do list."""
@@ -296,35 +330,41 @@ class O365TodoList(O365Entity, TodoListEntity):  # pylint: disable=abstract-meth
         await self._async_save_task(new_o365_task, subject, description, due, reminder)
         self._raise_event(EVENT_NEW_TODO, new_o365_task.task_id)
         self.todo_last_created = new_o365_task.created
-        await self.coordinator.async_refresh()
+        await self._async_todo_changed(new_o365_task.task_id, new_o365_task)
         return True
 
     async def async_update_todo_item(self, item: TodoItem) -> None:
         """Add an item to the To-do list."""
-        o365_task = await self.hass.async_add_executor_job(
-            self.todolist.get_task, item.uid
-        )
+        fetched_task = None
+        if held := self._get_held_task(item.uid):
+            current_task = held[0]
+        else:
+            current_task = fetched_task = await self.hass.async_add_executor_job(
+                self.todolist.get_task, item.uid
+            )
         if (
-            item.summary != o365_task.subject
-            or item.description != o365_task.body
-            or (item.due and item.due != o365_task.due)
+            item.summary != current_task.subject
+            or item.description != current_task.body
+            or (item.due and item.due != current_task.due)
         ):
             await self.async_update_todo(
                 todo_id=item.uid,
                 subject=item.summary,
                 description=item.description,
                 due=item.due,
-                o365_task=o365_task,
+                o365_task=fetched_task,
                 hatodo=True,
             )
         if item.status:
             completed = None
-            if item.status == TodoItemStatus.COMPLETED and not o365_task.completed:
+            if item.status == TodoItemStatus.COMPLETED and not current_task.completed:
                 completed = True
-            elif item.status == TodoItemStatus.NEEDS_ACTION and o365_task.completed:
+            elif item.status == TodoItemStatus.NEEDS_ACTION and current_task.completed:
                 completed = False
             if completed is not None:
-                await self.async_complete_todo(item.uid, completed, o365_task=o365_task)
+                await self.async_complete_todo(
+                    item.uid, completed, o365_task=fetched_task
+                )
 
     async def async_update_todo(
         self,
@@ -340,75 +380,204 @@ class O365TodoList(O365Entity, TodoListEntity):  # pylint: disable=abstract-meth
         if not self._validate_task_permissions():
             return False
 
-        if not o365_task:
-            o365_task = await self.hass.async_add_executor_job(
-                self.todolist.get_task, todo_id
-            )
-        await self._async_save_task(
-            o365_task, subject, description, due, reminder, hatodo
+        o365_task, etag = await self._async_task_request(
+            todo_id,
+            ft.partial(
+                self._async_save_task,
+                subject=subject,
+                description=description,
+                due=due,
+                reminder=reminder,
+                hatodo=hatodo,
+            ),
+            o365_task,
         )
         self._raise_event(EVENT_UPDATE_TODO, todo_id)
-        await self.coordinator.async_refresh()
+        await self._async_todo_changed(todo_id, o365_task, etag)
         return True
 
     async def async_delete_todo_items(self, uids: list[str]) -> None:
         """Delete items from the To-do list."""
-        for todo_id in uids:
-            await self.async_delete_todo(todo_id)
+        await self.async_delete_todos(uids)
 
     async def async_delete_todo(self, todo_id):
         """Delete task for this task list."""
         if not self._validate_task_permissions():
             return False
 
-        o365_task = await self.hass.async_add_executor_job(
-            self.todolist.get_task, todo_id
-        )
-        await self.hass.async_add_executor_job(o365_task.delete)
+        await self._async_task_request(todo_id, self._async_delete_task)
         self._raise_event(EVENT_DELETE_TODO, todo_id)
-        await self.coordinator.async_refresh()
+        await self._async_todo_changed(todo_id)
+        return True
+
+    async def async_delete_todos(self, todo_ids):
+        """Delete tasks for this task list, in batches."""
+        if not self._validate_task_permissions():
+            return False
+
+        deleted = await self._async_send_task_requests(todo_ids, "DELETE")
+        for todo_id in deleted:
+            self._raise_event(EVENT_DELETE_TODO, todo_id)
+        await self.coordinator.async_todos_changed(
+            self.entity_key, dict.fromkeys(deleted)
+        )
+        _raise_not_updated(todo_ids, deleted)
+        return True
+
+    async def async_complete_todos(self, todo_ids, completed):
+        """(Un)complete tasks for this task list, in batches."""
+        if not self._validate_task_permissions():
+            return False
+
+        # As for complete_todo, only tasks that change state are sent and raise events
+        todo_ids = [
+            todo_id
+            for todo_id in todo_ids
+            if not (todo := self._tasks.get(todo_id))
+            or (todo.status == "completed") != completed
+        ]
+        if not todo_ids:
+            return True
+
+        status = "completed" if completed else "notStarted"
+        updated = await self._async_send_task_requests(
+            todo_ids, "PATCH", {"status": status}
+        )
+        if completed and updated:
+            self.todo_last_completed = dt_util.utcnow()
+        for todo_id in updated:
+            self._raise_event(
+                EVENT_COMPLETED_TODO if completed else EVENT_UNCOMPLETED_TODO, todo_id
+            )
+
+        records = {
+            todo.task_id: todo._replace(
+                status=status,
+                completed=self.todo_last_completed if completed else None,
+                etag=None,
+            )
+            for todo in self.coordinator.data[self.entity_key].get(ATTR_DATA, [])
+            if todo.task_id in updated
+        }
+        if completed and not self._show_completed:
+            records = dict.fromkeys(records)
+        await self.coordinator.async_todos_changed(self.entity_key, records)
+        _raise_not_updated(todo_ids, updated)
         return True
 
+    async def _async_send_task_requests(self, todo_ids, method, body=None):
+        """Send the request for each task in batches, returning those that worked."""
+        responses, error = await self.hass.async_add_executor_job(
+            _send_task_requests,
+            self._config[CONF_ACCOUNT],
+            self.todolist,
+            todo_ids,
+            method,
+            body,
+        )
+        if error:
+            _LOGGER.warning("Error sending batch request - %s", error)
+
+        succeeded = set()
+        for todo_id, response in responses.items():
+            if response:
+                succeeded.add(todo_id)
+            else:
+                _LOGGER.warning(
+                    "Error updating todo %s - status %s", todo_id, response.status_code
+                )
+        return succeeded
+
     async def async_complete_todo(self, todo_id, completed, o365_task=None):
         """Complete task for this task list."""
         if not self._validate_task_permissions():
             return False
 
+        if completed:
+            o365_task, etag = await self._async_task_request(
+                todo_id,
+                ft.partial(self._async_complete_task, todo_id=todo_id),
+                o365_task,
+            )
+            await self._async_todo_changed(
+                todo_id,
+                o365_task,
+                etag,
+                status="completed",
+                completed=self.todo_last_completed,
+            )
+        else:
+            o365_task, etag = await self._async_task_request(
+                todo_id,
+                ft.partial(self._async_uncomplete_task, todo_id=todo_id),
+                o365_task,
+            )
+            await self._async_todo_changed(
+                todo_id, o365_task, etag, status="notStarted", completed=None
+            )
+        return True
+
+    async def _async_task_request(self, todo_id, request, o365_task=None):
+        """Make the request against the held task, fetching it only when needed.
+
+        The held task is guarded by its etag, so that a task changed elsewhere
+        since the last refresh is fetched and the request made again.
+        """
+        if not o365_task and (held := self._get_held_task(todo_id)):
+            held_task, etag = held
+            try:
+                return held_task, await request(held_task, etag=etag)
+            except HTTPError as err:
+                if err.response is None or err.response.status_code != 412:
+                    raise
+                _LOGGER.debug("Todo %s changed since the last refresh", todo_id)
+
         if not o365_task:
             o365_task = await self.hass.async_add_executor_job(
                 self.todolist.get_task, todo_id
             )
-        if completed:
-            await self._async_complete_task(o365_task, todo_id)
-        else:
-            await self._async_uncomplete_task(o365_task, todo_id)
-
-        await self.coordinator.async_refresh()
-        return True
+        return o365_task, await request(o365_task, etag=None)
+
+    def _get_held_task(self, todo_id):
+        todo = self._tasks.get(todo_id)
+        if not todo or not todo.etag:
+            return None
+        o365_task = build_api_object(
+            self.todolist,
+            self.todolist.task_constructor,
+            _build_task_data(todo),
+            folder_id=self.todolist.folder_id,
+        )
+        return o365_task, todo.etag
 
-    async def _async_complete_task(self, o365_task, todo_id):
+    async def _async_complete_task(self, o365_task, todo_id, etag=None):
         if o365_task.completed:
             raise ServiceValidationError(
                 translation_domain=DOMAIN,
                 translation_key="todo_completed",
             )
         o365_task.mark_completed()
-        self.hass.async_add_executor_job(o365_task.save)
+        etag = await self.hass.async_add_executor_job(_save_task, o365_task, etag)
         self._raise_event(EVENT_COMPLETED_TODO, todo_id)
         self.todo_last_completed = dt_util.utcnow()
+        return etag
 
-    async def _async_uncomplete_task(self, o365_task, todo_id):
+    async def _async_uncomplete_task(self, o365_task, todo_id, etag=None):
         if not o365_task.completed:
             raise ServiceValidationError(
                 translation_domain=DOMAIN,
                 translation_key="todo_not_completed",
             )
         o365_task.mark_uncompleted()
-        self.hass.async_add_executor_job(o365_task.save)
+        etag = await self.hass.async_add_executor_job(_save_task, o365_task, etag)
         self._raise_event(EVENT_UNCOMPLETED_TODO, todo_id)
+        return etag
+
+    async def _async_delete_task(self, o365_task, etag=None):
+        await self.hass.async_add_executor_job(_delete_task, o365_task, etag)
 
     async def _async_save_task(
-        self, o365_task, subject, description, due, reminder, hatodo=False
+        self, o365_task, subject, description, due, reminder, hatodo=False, etag=None
     ):
         # sourcery skip: raise-from-previous-error
         if subject or hatodo:
@@ -437,7 +606,16 @@ class O365TodoList(O365Entity, TodoListEntity):  # pylint: disable=abstract-meth
         if reminder:
             o365_task.reminder = reminder
 
-        await self.hass.async_add_executor_job(o365_task.save)
+        return await self.hass.async_add_executor_job(_save_task, o365_task, etag)
+
+    async def _async_todo_changed(self, todo_id, o365_task=None, etag=None, **changes):
+        """Show the change to the task straight away, ahead of the next refresh."""
+        record = None
+        if o365_task:
+            record = build_todo_record(o365_task, etag)._replace(**changes)
+            if record.status == "completed" and not self._show_completed:
+                record = None
+        await self.coordinator.async_todos_changed(self.entity_key, {todo_id: record})
 
     def _raise_event(self, event_type, todo_id):
         self.hass.bus.fire(
@@ -453,6 +631,146 @@ class O365TodoList(O365Entity, TodoListEntity):  # pylint: disable=abstract-meth
         )
 
 
+def _build_task_url(o365_task):
+    return o365_task.build_url(
+        GRAPH_ENDPOINT_TASK.format(
+            folder_id=o365_task.folder_id, task_id=o365_task.task_id
+        )
+    )
+
+
+def _save_task(o365_task, etag):
+    """Save the task, only if it is unchanged since the etag, returning the new etag."""
+    if not etag:
+        o365_task.save()
+        return None
+    track_changes = o365_task._track_changes  # pylint: disable=protected-access
+    if not track_changes:
+        return etag
+    response = o365_task.con.patch(
+        _build_task_url(o365_task),
+        data=o365_task.to_api_data(restrict_keys=track_changes),
+        headers={"If-Match": etag},
+    )
+    track_changes.clear()
+    return response.json().get("@odata.etag")
+
+
+def _delete_task(o365_task, etag):
+    if not etag:
+        o365_task.delete()
+        return
+    o365_task.con.delete(_build_task_url(o365_task), headers={"If-Match": etag})
+
+
+def _build_task_data(todo):
+    """Build the Graph JSON of a held task, from its record."""
+    data = {
+        "id": todo.task_id,
+        "title": todo.subject,
+        "body": {"content": todo.body, "contentType": todo.body_type},
+        "status": todo.status,
+        "isReminderOn": todo.is_reminder_on,
+    }
+    for field, value in (
+        ("dueDateTime", todo.due),
+        ("reminderDateTime", todo.reminder),
+        ("completedDateTime", todo.completed),
+    ):
+        if value:
+            data[field] = {
+                "dateTime": dt_util.as_utc(value).replace(tzinfo=None).isoformat(),
+                "timeZone": "UTC",
+            }
+    return data
+
+
+def _send_task_requests(account, todolist, todo_ids, method, body):
+    """Send the request for each task, retrying those Graph throttled.
+
+    Each batch is sent on its own, so that the responses to earlier batches
+    are kept if a later one cannot be sent. Returns the responses by task id,
+    and the error that stopped the sending, if any.
+    """
+    responses = {}
+    pending = list(todo_ids)
+    for attempt in range(TODO_BATCH_RETRIES + 1):
+        throttled = []
+        retry_after = 0
+        for start in range(0, len(pending), GRAPH_BATCH_MAX_REQUESTS):
+            try:
+                batch_responses = _send_task_batch(
+                    account,
+                    todolist,
+                    pending[start : start + GRAPH_BATCH_MAX_REQUESTS],
+                    method,
+                    body,
+                )
+            except (HTTPError, RetryError, ConnectionError) as err:
+                return responses, err
+            for todo_id, response in batch_responses.items():
+                responses[todo_id] = response
+                if response.status_code in GRAPH_THROTTLED_STATUS_CODES:
+                    throttled.append(todo_id)
+                    retry_after = max(retry_after, _get_retry_after(response))
+        if not throttled or attempt == TODO_BATCH_RETRIES:
+            break
+        _LOGGER.debug(
+            "%s todo request(s) throttled, retrying in %ss", len(throttled), retry_after
+        )
+        time.sleep(retry_after)
+        pending = throttled
+    return responses, None
+
+
+def _send_task_batch(account, todolist, todo_ids, method, body):
+    batch = O365GraphBatch(account)
+    request_ids = {
+        todo_id: batch.add(
+            todolist.build_url(
+                GRAPH_ENDPOINT_TASK.format(
+                    folder_id=todolist.folder_id, task_id=todo_id
+                )
+            ),
+            method=method,
+            body=body,
+        )
+        for todo_id in todo_ids
+    }
+    responses = batch.execute()
+    return {
+        todo_id: responses[request_id]
+        for todo_id, request_id in request_ids.items()
+        if request_id in responses
+    }
+
+
+def _get_retry_after(response):
+    """Seconds to wait before retrying a throttled request, as Graph asks."""
+    retry_after = next(
+        (
+            value
+            for header, value in response.headers.items()
+            if header.lower() == "retry-after"
+        ),
+        None,
+    )
+    try:
+        seconds = int(retry_after)
+    except (TypeError, ValueError):
+        seconds = TODO_BATCH_RETRY_DEFAULT_WAIT
+    return min(max(seconds, 0), TODO_BATCH_RETRY_MAX_WAIT)
+
+
+def _raise_not_updated(todo_ids, updated):
+    if not_updated := [todo_id for todo_id in todo_ids if todo_id not in updated]:
+        raise HomeAssistantError(
+            translation_domain=DOMAIN,
+            translation_key="todos_not_updated",
+            translation_placeholders={"todo_ids": ", ".join(not_updated)},
+        )
+
+
 def _raise_event_external(hass, event_type, todo_id, time_type, task_datetime):
     hass.bus.fire(
         f"{DOMAIN}_{event_type}",
@@ -461,6 +779,39 @@ def _raise_event_external(hass, event_type, todo_id, time_type, task_datetime):
     _LOGGER.debug("%s - %s - %s", event_type, todo_id, task_datetime)
 
 
+class O365TodoRecord(NamedTuple):
+    """The parts of a task shown by a todo list."""
+
+    task_id: str
+    subject: str
+    body: str
+    body_type: str
+    status: str | None
+    created: datetime | None
+    completed: datetime | None
+    due: datetime | None
+    is_reminder_on: bool
+    reminder: datetime | None
+    etag: str | None
+
+
+def build_todo_record(task, etag=None):
+    """Build the record of a task."""
+    return O365TodoRecord(
+        task_id=task.task_id,
+        subject=task.subject,
+        body=task.body,
+        body_type=task.body_type,
+        status=task.status,
+        created=task.created,
+        completed=task.completed,
+        due=task.due,
+        is_reminder_on=task.is_reminder_on,
+        reminder=task.reminder,
+        etag=etag,
+    )
+
+
 def build_todo_query(key, todo):
     """Build query for ToDo."""
     o365_task = key[CONF_YAML_TASK_LIST]
@@ -483,6 +834,34 @@ def build_todo_query(key, todo):
     return query
 
 
+def filter_todos(key, tasks):
+    """Apply the ToDo query locally to tasks held as Graph JSON."""
+    o365_task = key[CONF_YAML_TASK_LIST]
+    show_completed = o365_task[CONF_SHOW_COMPLETED]
+    start_offset = o365_task.get(CONF_DUE_HOURS_BACKWARD_TO_GET)
+    end_offset = o365_task.get(CONF_DUE_HOURS_FORWARD_TO_GET)
+    start = end = None
+    if start_offset:
+        start = dt_util.utcnow() + timedelta(hours=start_offset)
+        start = start.strftime("%Y-%m-%dT%H:%M:%S")
+    if end_offset:
+        end = dt_util.utcnow() + timedelta(hours=end_offset)
+        end = end.strftime("%Y-%m-%dT%H:%M:%S")
+
+    for task in tasks:
+        if not show_completed and task.get("status") == "completed":
+            continue
+        if start or end:
+            # Graph compares the due dateTime as written, excluding tasks with none
+            due = (task.get("dueDateTime") or {}).get("dateTime")
+            if not due:
+                continue
+            due = due[:19]
+            if (start and due < start) or (end and due > end):
+                continue
+        yield task
+
+
 class O365TodoEntityServices:
     """Sensor Services."""
 
@@ -492,8 +871,8 @@ class O365TodoEntityServices:
 
     async def async_scan_for_todo_lists(self, call):  # pylint: disable=unused-argument
         """Scan for new task lists."""
-        for config in self._hass.data[DOMAIN]:
-            config = self._hass.data[DOMAIN][config]
+        # Other accounts may be added while the task lists are being fetched
+        for config in list(self._hass.data[DOMAIN].values()):
             todo_sensor = config.get(CONF_TODO_SENSORS)
             if todo_sensor and CONF_ACCOUNT in config and todo_sensor.get(CONF_ENABLED):
                 todos = config[CONF_ACCOUNT].tasks()
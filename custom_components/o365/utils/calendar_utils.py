@@ -1,9 +1,14 @@
 """Calendar utilities processes."""
 
 import logging
-from datetime import datetime, timedelta
+import re
+from datetime import UTC, date, datetime, time, timedelta
+from zoneinfo import ZoneInfoNotFoundError
 
+from dateutil.parser import parse
+from dateutil.rrule import rrulestr
 from O365.calendar import Attendee  # pylint: disable=no-name-in-module)
+from O365.utils.windows_tz import get_iana_tz
 
 from ..const import (
     ATTR_ATTENDEES,
@@ -15,12 +20,27 @@ from ..const import (
     ATTR_SENSITIVITY,
     ATTR_SHOW_AS,
     DAYS,
+    FREQUENCIES,
     INDEXES,
 )
 from .utils import clean_html
 
 _LOGGER = logging.getLogger(__name__)
 
+OCCURRENCE_ID_FORMAT = "%Y%m%dT%H%M%SZ"
+OCCURRENCE_ID_SEPARATOR = "|"
+RRULE_DAYS = {day: rrule_day for rrule_day, day in DAYS.items()}
+RRULE_INDEXES = {index: rrule_index for rrule_index, index in INDEXES.items()}
+EVENT_FILTER_FIELDS = {
+    "subject": lambda event: (event.subject,),
+    "location": lambda event: (event.location.get("displayName"),),
+    "categories": lambda event: event.categories,
+    "body": lambda event: (clean_html(event.body),),
+    "organizer": lambda event: (
+        (event.organizer.name, event.organizer.address) if event.organizer else ()
+    ),
+}
+
 
 def format_event_data(event):
     """Format the event data."""
@@ -42,6 +62,55 @@ def format_event_data(event):
     }
 
 
+def build_event_filter(search=None, include=None, exclude=None):
+    """Build a predicate for the events to show, or None to show them all.
+
+    Each field in include must match one of its patterns, and no field in
+    exclude may match any of its patterns. An exclude list applies to the subject.
+    """
+    if isinstance(exclude, list):
+        exclude = {"subject": exclude}
+    includes = _compile_event_fields(include)
+    if search is not None:
+        # Graph matched search without regard to case
+        search_pattern = re.compile(re.escape(search), re.IGNORECASE)
+        includes.insert(0, (EVENT_FILTER_FIELDS["subject"], (search_pattern,)))
+    excludes = _compile_event_fields(exclude)
+    if not includes and not excludes:
+        return None
+
+    def _matches(event, field, patterns):
+        return any(
+            value and pattern.search(value)
+            for value in field(event)
+            for pattern in patterns
+        )
+
+    def _event_filter(event):
+        return all(
+            _matches(event, field, patterns) for field, patterns in includes
+        ) and not any(_matches(event, field, patterns) for field, patterns in excludes)
+
+    return _event_filter
+
+
+def _compile_event_fields(patterns):
+    # Compiled on their own, as patterns may start with inline flags such as (?i)
+    compiled = []
+    for field, field_patterns in (patterns or {}).items():
+        field_compiled = []
+        for pattern in field_patterns or []:
+            try:
+                field_compiled.append(re.compile(pattern))
+            except re.error as err:
+                _LOGGER.error(
+                    "Invalid calendar %s pattern: %s - %s", field, pattern, err
+                )
+        if field_compiled:
+            compiled.append((EVENT_FILTER_FIELDS[field], tuple(field_compiled)))
+    return compiled
+
+
 def get_hass_date(obj, is_all_day):
     """Get the date."""
     return obj if isinstance(obj, datetime) and not is_all_day else obj.date()
@@ -157,3 +226,121 @@ def _process_byday(byday):
             days.append(DAYS[item[:2]])
             index = None
     return days, index
+
+
+def build_rrule(recurrence, tzinfo):
+    """Build an RRULE from a Graph recurrence, the reverse of _rrule_processing."""
+    pattern = recurrence["pattern"]
+    recurrence_range = recurrence["range"]
+    pattern_type = pattern["type"]
+    rules = {
+        "FREQ": FREQUENCIES[pattern_type],
+        "INTERVAL": pattern.get("interval") or 1,
+    }
+    days = ",".join(RRULE_DAYS[day] for day in pattern.get("daysOfWeek") or [])
+    if pattern_type == "weekly":
+        if days:
+            rules["BYDAY"] = days
+        rules["WKST"] = RRULE_DAYS[pattern.get("firstDayOfWeek") or "sunday"]
+    elif pattern_type.startswith("relative"):
+        rules["BYDAY"] = days
+        rules["BYSETPOS"] = RRULE_INDEXES[pattern.get("index") or "first"]
+    elif pattern_type.startswith("absolute"):
+        rules["BYMONTHDAY"] = pattern["dayOfMonth"]
+    if pattern_type.endswith("Yearly"):
+        rules["BYMONTH"] = pattern["month"]
+
+    if recurrence_range["type"] == "numbered":
+        rules["COUNT"] = recurrence_range["numberOfOccurrences"]
+    elif recurrence_range["type"] == "endDate":
+        until = datetime.combine(
+            date.fromisoformat(recurrence_range["endDate"]), time.max, tzinfo
+        )
+        rules["UNTIL"] = until.astimezone(UTC).strftime(OCCURRENCE_ID_FORMAT)
+    return ";".join(f"{key}={value}" for key, value in rules.items())
+
+
+def expand_series_master(master, start_date, end_date, occurrence_starts):
+    """Expand a Graph series master into the occurrences overlapping the dates.
+
+    Only occurrences with their start in occurrence_starts are kept, so
+    that those cancelled or replaced by an exception are left out.
+    """
+    start_tz = _get_time_zone(master["start"]["timeZone"])
+    end_tz = _get_time_zone(master["end"]["timeZone"], start_tz)
+    start = parse(master["start"]["dateTime"]).replace(tzinfo=start_tz)
+    duration = parse(master["end"]["dateTime"]).replace(tzinfo=end_tz) - start
+    recurrence = master["recurrence"]
+    recurrence_range = recurrence["range"]
+    if not master.get("isAllDay"):
+        # Keep the wall clock time of the series through daylight saving changes
+        start = start.astimezone(
+            _get_time_zone(recurrence_range.get("recurrenceTimeZone"), start_tz)
+        )
+    rule = rrulestr(
+        build_rrule(recurrence, start.tzinfo),
+        dtstart=datetime.combine(
+            date.fromisoformat(recurrence_range["startDate"]), start.timetz()
+        ),
+    )
+
+    all_day = master.get("isAllDay")
+
+    def match_key(value):
+        # All day occurrences are matched on their date in the series time zone
+        return value.astimezone(start_tz).date() if all_day else value
+
+    kept = {match_key(value) for value in occurrence_starts}
+    occurrences = []
+    for occurrence_start in rule.between(start_date - duration, end_date):
+        if match_key(occurrence_start) not in kept:
+            continue
+        occurrence_start = occurrence_start.astimezone(start_tz)
+        occurrence_end = (occurrence_start + duration).astimezone(end_tz)
+        occurrences.append(
+            master
+            | {
+                "id": build_occurrence_id(master["id"], occurrence_start),
+                "type": "occurrence",
+                "seriesMasterId": master["id"],
+                "start": _format_date_time_zone(occurrence_start, master["start"]),
+                "end": _format_date_time_zone(occurrence_end, master["end"]),
+                "recurrence": None,
+            }
+        )
+    return occurrences
+
+
+def build_occurrence_id(series_master_id, start):
+    """Build the id of a locally expanded occurrence."""
+    return (
+        f"{series_master_id}{OCCURRENCE_ID_SEPARATOR}"
+        f"{start.astimezone(UTC).strftime(OCCURRENCE_ID_FORMAT)}"
+    )
+
+
+def parse_occurrence_id(event_id):
+    """Get the series master id and start of a locally expanded occurrence."""
+    series_master_id, _, start = event_id.partition(OCCURRENCE_ID_SEPARATOR)
+    if not start:
+        return None
+    return (
+        series_master_id,
+        datetime.strptime(start, OCCURRENCE_ID_FORMAT).replace(tzinfo=UTC),
+    )
+
+
+def _get_time_zone(windows_tz, default=UTC):
+    if not windows_tz:
+        return default
+    try:
+        return get_iana_tz(windows_tz)
+    except ZoneInfoNotFoundError:
+        return default
+
+
+def _format_date_time_zone(value, date_time_zone):
+    return {
+        "dateTime": value.replace(tzinfo=None).isoformat(),
+        "timeZone": date_time_zone["timeZone"],
+    }
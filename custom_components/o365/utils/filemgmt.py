@@ -1,5 +1,6 @@
 """File management processes."""
 
+import json
 import logging
 import os
 
@@ -47,6 +48,26 @@ def load_yaml_file(path, item_id, item_schema):
     return items
 
 
+def load_json_file(path):
+    """Load an o365 json file."""
+    try:
+        with open(path, encoding="utf8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+    except ValueError as exception:
+        _LOGGER.warning("Invalid Data in %s: %s", path, exception)
+        return {}
+
+
+def save_json_file(path, data):
+    """Save an o365 json file, replacing any existing file."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf8") as file:
+        json.dump(data, file)
+    os.replace(temp_path, path)
+
+
 def _write_yaml_file(yaml_filepath, yaml_list):
     with open(yaml_filepath, "a", encoding="UTF8") as out:
         out.write("\n")
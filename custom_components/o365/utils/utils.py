@@ -1,19 +1,311 @@
 """Utilities processes."""
 import logging
+from datetime import datetime
+from enum import Enum
+from html import escape, unescape
+from html.entities import html5
+from html.parser import HTMLParser
+from typing import NamedTuple
 
-from bs4 import BeautifulSoup
-
-from ..const import DATETIME_FORMAT
+from ..const import (
+    CONF_DOWNLOAD_ATTACHMENTS,
+    CONF_HTML_BODY,
+    CONF_HTML_BODY_MAX_SIZE,
+    CONF_SHOW_BODY,
+    DATETIME_FORMAT,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# The tag handling of BeautifulSoup's html.parser tree builder
+_ASCII_SPACES = " \n\t\x0c\r"
+_EMPTY_ELEMENT_TAGS = frozenset(
+    (
+        "area",
+        "base",
+        "basefont",
+        "bgsound",
+        "br",
+        "col",
+        "command",
+        "embed",
+        "frame",
+        "hr",
+        "image",
+        "img",
+        "input",
+        "isindex",
+        "keygen",
+        "link",
+        "menuitem",
+        "meta",
+        "nextid",
+        "param",
+        "source",
+        "spacer",
+        "track",
+        "wbr",
+    )
+)
+_LIST_ATTRIBUTES = {
+    "a": frozenset(("rel", "rev")),
+    "area": frozenset(("rel",)),
+    "form": frozenset(("accept-charset",)),
+    "icon": frozenset(("sizes",)),
+    "iframe": frozenset(("sandbox",)),
+    "link": frozenset(("rel", "rev")),
+    "object": frozenset(("archive",)),
+    "output": frozenset(("for",)),
+    "td": frozenset(("headers",)),
+    "th": frozenset(("headers",)),
+}
+_LIST_ATTRIBUTES_ALL_TAGS = frozenset(("accesskey", "class", "dropzone"))
+_PRESERVE_WHITESPACE_TAGS = frozenset(("pre", "textarea"))
+_NON_TEXT_TAGS = frozenset(("rp", "rt", "script", "style", "template"))
+# Markup around strings that are not text
+_CDATA = ("<![CDATA[", "]]>")
+_COMMENT = ("<!--", "-->")
+_DECLARATION = ("<?", "?>")
+_DOCTYPE = ("<!DOCTYPE ", ">\n")
+_PROCESSING_INSTRUCTION = ("<?", ">")
+
+_SAFE_HTML_BLOCKLIST = frozenset(("script", "style"))
+_SAFE_HTML_FEED_SIZE = 8192
+
+
+class _BodyParser(HTMLParser):
+    """Follow the first body element through the HTML without building a tree.
+
+    Subclasses handle the tags and strings that BeautifulSoup would place
+    in the body.
+    """
+
+    def __init__(self):
+        """Initialise the parser."""
+        super().__init__(convert_charrefs=False)
+        self.body_found = False
+        self._data = []
+        self._open_tags = []
+        self._body = None
+        self._closed_empty_tags = []
+
+    def close(self):
+        """Handle any remaining data and close any open tags."""
+        super().close()
+        self._end_data()
+        self._close_tags(0)
+
+    def handle_starttag(self, tag, attrs):
+        """Open the tag, closing it straight away if it is an empty element."""
+        self._start_tag(tag, attrs)
+        if tag in _EMPTY_ELEMENT_TAGS:
+            self._end_tag(tag)
+            # An end tag may still follow in the markup, which is then ignored
+            self._closed_empty_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        """Open and close the tag."""
+        self._start_tag(tag, attrs)
+        self._end_tag(tag)
+
+    def handle_endtag(self, tag):
+        """Close the tag and any tags still open within it."""
+        if tag in self._closed_empty_tags:
+            self._closed_empty_tags.remove(tag)
+        else:
+            self._end_tag(tag)
+
+    def handle_data(self, data):
+        """Add to the current string."""
+        self._data.append(data)
+
+    def handle_charref(self, name):
+        """Add a numeric character reference to the current string."""
+        self._data.append(unescape(f"&#{name};"))
+
+    def handle_entityref(self, name):
+        """Add a named character reference to the current string."""
+        self._data.append(html5.get(f"{name};", f"&{name}"))
+
+    def handle_comment(self, data):
+        """Add the comment as a string of its own."""
+        self._add_string(data, _COMMENT)
+
+    def handle_decl(self, decl):
+        """Add the doctype as a string of its own."""
+        self._add_string(decl[8:], _DOCTYPE)
+
+    def handle_pi(self, data):
+        """Add the processing instruction as a string of its own."""
+        self._add_string(data, _PROCESSING_INSTRUCTION)
+
+    def unknown_decl(self, data):
+        """Add a CDATA section or declaration as a string of its own."""
+        if data.upper().startswith("CDATA["):
+            self._add_string(data[6:], _CDATA)
+        else:
+            self._add_string(data, _DECLARATION)
+
+    def _body_start(self, tag, attrs):
+        """Handle a tag opened within the body."""
+
+    def _body_end(self, tag):
+        """Handle a tag closed within the body."""
+
+    def _body_string(self, data, markup):
+        """Handle a string within the body, markup being None for text."""
+
+    def _start_tag(self, tag, attrs):
+        self._end_data()
+        self._open_tags.append(tag)
+        if tag == "body" and not self.body_found:
+            self.body_found = True
+            self._body = len(self._open_tags) - 1
+        if self._body is not None:
+            self._body_start(tag, attrs)
+
+    def _end_tag(self, tag):
+        self._end_data()
+        if tag not in self._open_tags:
+            return
+        self._close_tags(len(self._open_tags) - self._open_tags[::-1].index(tag) - 1)
+
+    def _close_tags(self, position):
+        if self._body is not None:
+            for open_tag in reversed(self._open_tags[max(position, self._body) :]):
+                self._body_end(open_tag)
+            if self._body >= position:
+                self._body = None
+        del self._open_tags[position:]
+
+    def _add_string(self, data, markup):
+        self._end_data()
+        self._data.append(data)
+        self._end_data(markup)
+
+    def _end_data(self, markup=None):
+        if not self._data:
+            return
+        data = "".join(self._data)
+        self._data = []
+        if self._body is None:
+            return
+        if _PRESERVE_WHITESPACE_TAGS.isdisjoint(self._open_tags) and not data.strip(
+            _ASCII_SPACES
+        ):
+            data = "\n" if "\n" in data else " "
+        self._body_string(data, markup)
+
+
+class _BodyTextParser(_BodyParser):
+    """Collect the text of the body.
+
+    The text is the same as BeautifulSoup's get_text() on the body.
+    """
+
+    def __init__(self):
+        """Initialise the parser."""
+        super().__init__()
+        self.text = []
+
+    def _body_string(self, data, markup):
+        if markup is _CDATA or (
+            markup is None and _NON_TEXT_TAGS.isdisjoint(self._open_tags)
+        ):
+            self.text.append(data)
+
+
+class _SafeBodyParser(_BodyParser):
+    """Write out the body without blocklisted elements and their contents.
+
+    The HTML is the same as BeautifulSoup writes for the body. Once it
+    would go over max_size bytes, writing stops and the open elements
+    are closed. Room for closing the open elements is kept within
+    max_size.
+    """
+
+    def __init__(self, max_size=None):
+        """Initialise the parser."""
+        super().__init__()
+        self.html = []
+        self.truncated = False
+        self._max_size = max_size
+        self._size = 0
+        self._closing_size = 0
+        self._blocked = 0
+        self._written_tags = []
+
+    def _body_start(self, tag, attrs):
+        if self._blocked or tag in _SAFE_HTML_BLOCKLIST:
+            self._blocked += 1
+        elif tag in _EMPTY_ELEMENT_TAGS:
+            self._write(f"<{tag}{_format_attributes(tag, attrs)}/>")
+        elif self._write(f"<{tag}{_format_attributes(tag, attrs)}>", f"</{tag}>"):
+            self._written_tags.append(tag)
+
+    def _body_end(self, tag):
+        if self._blocked:
+            self._blocked -= 1
+        elif tag not in _EMPTY_ELEMENT_TAGS and not self.truncated:
+            self._written_tags.pop()
+            # Its room was kept when the tag was opened
+            closing = f"</{tag}>"
+            self._closing_size -= len(closing)
+            self._size += len(closing)
+            self.html.append(closing)
+
+    def _body_string(self, data, markup):
+        if self._blocked:
+            return
+        if markup is None:
+            self._write(escape(data, quote=False))
+        else:
+            self._write(f"{markup[0]}{data}{markup[1]}")
+
+    def _write(self, html, closing=""):
+        if self.truncated:
+            return False
+        size = len(html.encode())
+        if (
+            self._max_size is not None
+            and self._size + size + self._closing_size + len(closing) > self._max_size
+        ):
+            self.truncated = True
+            self.html.extend(f"</{tag}>" for tag in reversed(self._written_tags))
+            return False
+        self._size += size
+        self._closing_size += len(closing)
+        self.html.append(html)
+        return True
+
+
+def _format_attributes(tag, attrs):
+    # Repeated attributes take the last value
+    values = {key: value or "" for key, value in attrs}
+    list_attributes = _LIST_ATTRIBUTES.get(tag, ())
+    formatted = []
+    for key, value in sorted(values.items()):
+        if key in _LIST_ATTRIBUTES_ALL_TAGS or key in list_attributes:
+            value = " ".join(value.split())
+        value = escape(value, quote=False)
+        if '"' not in value:
+            formatted.append(f' {key}="{value}"')
+        elif "'" not in value:
+            formatted.append(f" {key}='{value}'")
+        else:
+            value = value.replace('"', "&quot;")
+            formatted.append(f' {key}="{value}"')
+    return "".join(formatted)
+
 
 def clean_html(html):
     """Clean the HTML."""
-    soup = BeautifulSoup(html, features="html.parser")
-    if body := soup.find("body"):
+    parser = _BodyTextParser()
+    parser.feed(html)
+    parser.close()
+    if parser.body_found:
         # get text
-        text = body.get_text()
+        text = "".join(parser.text)
 
         # break into lines and remove leading and trailing space on each
         lines = (line.strip() for line in text.splitlines())
@@ -26,41 +318,116 @@ def clean_html(html):
     return html
 
 
-def _safe_html(html):
+def _safe_html(html, max_size=None):
     """Make the HTML safe."""
-    soup = BeautifulSoup(html, features="html.parser")
-    if soup.find("body"):
-        blacklist = ["script", "style"]
-        for tag in soup.findAll():
-            if tag.name.lower() in blacklist:
-                # blacklisted tags are removed in their entirety
-                tag.extract()
-        return str(soup.find("body"))
+    parser = _SafeBodyParser(max_size)
+    if max_size is None:
+        parser.feed(html)
+    else:
+        # Stop reading once the output is full
+        for start in range(0, len(html), _SAFE_HTML_FEED_SIZE):
+            parser.feed(html[start : start + _SAFE_HTML_FEED_SIZE])
+            if parser.truncated:
+                break
+    parser.close()
+    if parser.body_found:
+        return "".join(parser.html)
     return html
 
 
-def get_email_attributes(mail, download_attachments, html_body, show_body):
+class O365MailFlag(NamedTuple):
+    """Follow up flag of an email."""
+
+    is_flagged: bool
+    is_completed: bool
+    due_date: datetime | None
+    completion_date: datetime | None
+
+
+class O365MailRecord(NamedTuple):
+    """The parts of an email shown by a mail sensor."""
+
+    subject: str
+    received: datetime
+    to: tuple[str, ...]
+    cc: tuple[str, ...]
+    sender: str
+    has_attachments: bool
+    importance: str
+    is_read: bool
+    flag: O365MailFlag
+    body: str | None
+    attachments: tuple[str, ...] | None
+
+
+def build_mail_record(mail, sensor_conf):
+    """Build the record of an email, rendering the body as the sensor shows it."""
+    body = attachments = None
+    if sensor_conf.get(CONF_HTML_BODY):
+        body = _safe_html(mail.body, sensor_conf.get(CONF_HTML_BODY_MAX_SIZE))
+    elif sensor_conf.get(CONF_SHOW_BODY):
+        body = clean_html(mail.body)
+    if sensor_conf.get(CONF_DOWNLOAD_ATTACHMENTS):
+        attachments = tuple(x.name for x in mail.attachments)
+
+    return O365MailRecord(
+        subject=mail.subject,
+        received=mail.received,
+        to=tuple(x.address for x in mail.to),
+        cc=tuple(x.address for x in mail.cc),
+        sender=mail.sender.address,
+        has_attachments=mail.has_attachments,
+        importance=mail.importance.value,
+        is_read=mail.is_read,
+        flag=O365MailFlag(
+            is_flagged=mail.flag.is_flagged,
+            is_completed=mail.flag.is_completed,
+            due_date=mail.flag.due_date,
+            completion_date=mail.flag.completition_date,
+        ),
+        body=body,
+        attachments=attachments,
+    )
+
+
+class O365AutoReplyRecord(NamedTuple):
+    """The parts of the auto reply settings shown by an auto reply sensor."""
+
+    internal_reply_message: str
+    external_reply_message: str
+    external_audience: Enum
+    scheduled_startdatetime: datetime
+    scheduled_enddatetime: datetime
+
+
+def build_auto_reply_record(settings):
+    """Build the record of the auto reply settings."""
+    return O365AutoReplyRecord(
+        internal_reply_message=settings.internal_reply_message,
+        external_reply_message=settings.external_reply_message,
+        external_audience=settings.external_audience,
+        scheduled_startdatetime=settings.scheduled_startdatetime,
+        scheduled_enddatetime=settings.scheduled_enddatetime,
+    )
+
+
+def get_email_attributes(mail):
     """Get the email attributes."""
     data = {
         "subject": mail.subject,
         "received": mail.received.strftime(DATETIME_FORMAT),
-        "to": [x.address for x in mail.to],
-        "cc": [x.address for x in mail.cc],
-        "sender": mail.sender.address,
+        "to": list(mail.to),
+        "cc": list(mail.cc),
+        "sender": mail.sender,
         "has_attachments": mail.has_attachments,
-        "importance": mail.importance.value,
+        "importance": mail.importance,
         "is_read": mail.is_read,
-        "flag": {
-            "is_flagged": mail.flag.is_flagged,
-            "is_completed": mail.flag.is_completed,
-            "due_date": mail.flag.due_date,
-            "completion_date": mail.flag.completition_date,
-        },
+        "flag": mail.flag._asdict(),
     }
 
-    if show_body or html_body:
-        data["body"] = _safe_html(mail.body) if html_body else clean_html(mail.body)
-    if download_attachments:
-        data["attachments"] = [x.name for x in mail.attachments]
+    if mail.body is not None:
+        data["body"] = mail.body
+    if mail.attachments is not None:
+        data["attachments"] = list(mail.attachments)
 
     return data
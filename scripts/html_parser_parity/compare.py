@@ -0,0 +1,205 @@
+"""Compare clean_html and _safe_html with the BeautifulSoup versions they replaced.
+
+The streaming parsers in utils/utils.py follow the tree building rules of
+BeautifulSoup's html.parser builder. This script checks their output byte
+for byte against the original BeautifulSoup implementations, over the
+documents in corpus/ and randomly assembled documents, then times both.
+
+It needs beautifulsoup4, which the integration itself no longer uses:
+
+    python3 -m pip install beautifulsoup4
+    python3 scripts/html_parser_parity/compare.py --random 10000
+
+Exits non-zero if any output differs.
+"""
+
+import argparse
+import importlib
+import random
+import sys
+import timeit
+import types
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+HERE = Path(__file__).resolve().parent
+PACKAGE_DIR = HERE.parent.parent / "custom_components" / "o365"
+
+FRAGMENTS = (
+    "<p>",
+    "</p>",
+    "<div class='a  b'>",
+    "</div>",
+    "<span>",
+    "</span>",
+    "<b>",
+    "</b>",
+    "<body>",
+    "</body>",
+    "<html>",
+    "</html>",
+    "<br>",
+    "<br/>",
+    "<hr>",
+    "<img src=x alt='y'>",
+    "<input disabled>",
+    "<pre>",
+    "</pre>",
+    "<textarea>",
+    "</textarea>",
+    "<script>x<p>y</p></script>",
+    "<style>p{}</style>",
+    "<template>t</template>",
+    "<rt>r</rt>",
+    "<rp>(</rp>",
+    "<title>t</title>",
+    "<![CDATA[c<b>d</b>]]>",
+    "<!-- comment -->",
+    "<!DOCTYPE html>",
+    "<?pi?>",
+    '<a href="u?a=1&amp;b=2" title=\'q"\'>',
+    "</a>",
+    "<td>",
+    "<tr>",
+    "<table>",
+    "</table>",
+    "<li>",
+    "<P>",
+    "<BODY bgcolor=red>",
+    "text",
+    "two  spaces",
+    "  ",
+    "\n",
+    "\n  \n",
+    "\t",
+    "&amp;",
+    "&nbsp;",
+    "&lt;x&gt;",
+    "&copy;",
+    "&#169;",
+    "&#xA9;",
+    "&unknown;",
+    "&ampx",
+    "<",
+    ">",
+    "&",
+    "é漢",
+)
+
+
+def load_utils():
+    """Import utils/utils.py without importing Home Assistant."""
+    package = types.ModuleType("o365")
+    package.__path__ = [str(PACKAGE_DIR)]
+    sys.modules["o365"] = package
+    return importlib.import_module("o365.utils.utils")
+
+
+def bs4_clean_html(html):
+    """clean_html as it was with BeautifulSoup."""
+    soup = BeautifulSoup(html, features="html.parser")
+    if body := soup.find("body"):
+        text = body.get_text()
+        lines = (line.strip() for line in text.splitlines())
+        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        text = "\n".join(chunk for chunk in chunks if chunk)
+        return text.replace("\xa0", " ")
+    return html
+
+
+def bs4_safe_html(html):
+    """_safe_html as it was with BeautifulSoup."""
+    soup = BeautifulSoup(html, features="html.parser")
+    if soup.find("body"):
+        for tag in soup.find_all():
+            if tag.name.lower() in ["script", "style"]:
+                tag.extract()
+        return str(soup.find("body"))
+    return html
+
+
+def implementations(utils):
+    """The old and new implementation of each function, by function name."""
+    return (
+        ("clean_html", bs4_clean_html, utils.clean_html),
+        ("_safe_html", bs4_safe_html, utils._safe_html),  # pylint: disable=protected-access
+    )
+
+
+def load_corpus():
+    """Read the corpus documents, by file name."""
+    return {
+        path.name: path.read_text(encoding="utf-8")
+        for path in sorted((HERE / "corpus").glob("*.html"))
+    }
+
+
+def random_documents(count, seed):
+    """Assemble random documents from the fragments."""
+    rng = random.Random(seed)
+    for number in range(count):
+        yield (
+            f"random-{number}",
+            "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 40))),
+        )
+
+
+def compare(utils, documents):
+    """Compare the outputs for each document, returning the failures."""
+    failures = []
+    for name, html in documents:
+        for function, old, new in implementations(utils):
+            expected = old(html)
+            actual = new(html)
+            if expected != actual:
+                failures.append((name, function, html, expected, actual))
+    return failures
+
+
+def benchmark(utils, corpus, number):
+    """Time the old and new implementations over the corpus."""
+    for function, old, new in implementations(utils):
+        for label, implementation in (("bs4", old), ("streaming", new)):
+            seconds = timeit.timeit(
+                lambda implementation=implementation: [
+                    implementation(html) for html in corpus.values()
+                ],
+                number=number,
+            )
+            print(
+                f"{function:<11} {label:<10} "
+                f"{seconds / number / len(corpus) * 1e6:8.1f} us per document"
+            )
+
+
+def main():
+    """Run the comparison and the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--random", type=int, default=1000, help="random documents to compare"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument(
+        "--number", type=int, default=20, help="benchmark passes over the corpus"
+    )
+    args = parser.parse_args()
+
+    utils = load_utils()
+    corpus = load_corpus()
+    failures = compare(utils, corpus.items())
+    failures += compare(utils, random_documents(args.random, args.seed))
+    for name, function, html, expected, actual in failures[:10]:
+        print(f"MISMATCH {function} {name}\n  html:     {html!r}")
+        print(f"  bs4:      {expected!r}\n  streaming: {actual!r}")
+    print(
+        f"Compared {len(corpus)} corpus and {args.random} random documents: "
+        f"{len(failures)} mismatch(es)"
+    )
+    if args.number:
+        benchmark(utils, corpus, args.number)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())